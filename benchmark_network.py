@@ -0,0 +1,301 @@
+#File: benchmark_network.py
+#Author: Taylor King
+#Description: Benchmark suite for network.py. Seeded synthetic graph generators (Erdos-Renyi,
+#  Barabasi-Albert and a power-law configuration model) produce realistic, skewed-degree inputs
+#  from 10^3 up to 10^7 edges. Each workload is timed, optionally with its peak memory, and the
+#  results can be saved as, or compared against, a JSON file of baselines. Baselines for the
+#  default scale are kept in data/benchmark_baselines.json.
+#
+#  Usage:
+#    python benchmark_network.py                        #Run up to 10^5 edges and compare to the baselines.
+#    python benchmark_network.py --max-edges 10000000   #Run the full scale.
+#    python benchmark_network.py --memory               #Also record peak memory (runs each workload twice).
+#    python benchmark_network.py --save-baseline        #Store the results as the new baselines.
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import network
+
+#Edge counts the suite scales through.
+SCALES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+#edge_to_neighbour_list_2 rescans the whole edge list per node, so it is only timed on small inputs.
+MULTI_PASS_MAX_EDGES = 10**4
+
+DEFAULT_BASELINE_PATH = './data/benchmark_baselines.json'
+
+#Generators.
+def erdos_renyi_edges(n_edges, n_nodes=None, seed=None):
+    """
+    Generate a G(n, m) Erdos-Renyi random graph: `n_edges` distinct edges chosen
+    uniformly among `n_nodes` nodes. Degrees are close to Poisson distributed.
+
+    :param n_edges: Number of edges to generate.
+    :param n_nodes: Number of nodes (default n_edges // 4, an average degree of 8).
+    :param seed: Seed for the random number generator.
+    :return: List of (a, b) edge tuples with a < b.
+    """
+    n_nodes = n_nodes if n_nodes is not None else max(n_edges // 4, 2)
+    assert n_edges <= n_nodes * (n_nodes - 1) // 2, "Too many edges for the number of nodes."
+
+    rng = random.Random(seed)
+    seen = set()
+    edges = []
+    while len(edges) < n_edges:
+        a, b = rng.randrange(n_nodes), rng.randrange(n_nodes)
+        if a == b:
+            continue
+        edge = (a, b) if a < b else (b, a)
+        if edge not in seen:
+            seen.add(edge)
+            edges.append(edge)
+    return edges
+
+def barabasi_albert_edges(n_edges, m=4, seed=None):
+    """
+    Generate a Barabasi-Albert preferential attachment graph. Each new node
+    attaches to `m` distinct existing nodes chosen with probability
+    proportional to their degree, giving a power-law degree tail with hubs.
+
+    :param n_edges: Approximate number of edges to generate (rounded to a multiple of m).
+    :param m: Edges added per new node.
+    :param seed: Seed for the random number generator.
+    :return: List of (new_node, existing_node) edge tuples.
+    """
+    rng = random.Random(seed)
+    edges = []
+    #Every endpoint is listed once per incident edge, so a uniform pick is degree-proportional.
+    endpoints = list(range(m))
+    node = m
+    while len(edges) + m <= max(n_edges, m):
+        targets = set()
+        while len(targets) < m:
+            targets.add(endpoints[rng.randrange(len(endpoints))])
+        for target in targets:
+            edges.append((node, target))
+            endpoints.append(node)
+            endpoints.append(target)
+        node += 1
+    return edges
+
+def configuration_model_edges(n_edges, exponent=2.5, min_degree=1, seed=None):
+    """
+    Generate a power-law configuration model graph. Degrees are drawn from
+    a discrete power law P(k) ~ k^-exponent, and edge stubs are matched at
+    random. Self-loops and repeated edges are discarded (the "erased" model),
+    so slightly fewer than `n_edges` edges may be returned.
+
+    :param n_edges: Target number of edges.
+    :param exponent: Power-law exponent of the degree distribution (> 1).
+    :param min_degree: Smallest degree drawn.
+    :param seed: Seed for the random number generator.
+    :return: List of (a, b) edge tuples with a < b.
+    """
+    assert exponent > 1, "exponent must be greater than 1."
+    rng = random.Random(seed)
+
+    #Draw degrees by inverse transform sampling until there are enough stubs.
+    stubs = []
+    node = 0
+    while len(stubs) < 2 * n_edges:
+        degree = int(min_degree * (1 - rng.random()) ** (-1 / (exponent - 1)))
+        stubs.extend([node] * min(degree, 2 * n_edges - len(stubs)))
+        node += 1
+    rng.shuffle(stubs)
+
+    seen = set()
+    edges = []
+    for i in range(0, len(stubs) - 1, 2):
+        a, b = stubs[i], stubs[i + 1]
+        if a == b:
+            continue
+        edge = (a, b) if a < b else (b, a)
+        if edge not in seen:
+            seen.add(edge)
+            edges.append(edge)
+    return edges
+
+GENERATORS = {
+    'erdos_renyi': erdos_renyi_edges,
+    'barabasi_albert': barabasi_albert_edges,
+    'configuration_model': configuration_model_edges,
+}
+
+def write_edge_file(edges, fName):
+    """
+    Write edges to a TSV file in the format read by network.file_to_edge_list.
+    """
+    with open(fName, 'w') as f:
+        for (a, b) in edges:
+            f.write(f"{a}\t{b}\n")
+
+#Measurement.
+def measure(func, *args, memory=False, **kwargs):
+    """
+    Run func untraced for the wall time. With memory=True, run it a second
+    time under tracemalloc for the peak memory, since tracing slows the code
+    it traces; func must then not modify its arguments.
+
+    :return: (result of the timed run, seconds, peak_bytes or None)
+    """
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    if not memory:
+        return result, seconds, None
+
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+def _clustering_all(neighbour_dict):
+    """
+    Compute the clustering coefficient of every node.
+    """
+    return [network.get_clustering_coefficient(network=neighbour_dict, node=node) for node in neighbour_dict]
+
+def run_workload(generator_name, n_edges, seed=0, workdir=None, memory=False):
+    """
+    Generate one graph and time every network.py workload on it.
+
+    :param generator_name: Key into GENERATORS.
+    :param n_edges: Target number of edges.
+    :param seed: Seed passed to the generator.
+    :param workdir: Directory for the temporary TSV file.
+    :param memory: Also record each workload's peak memory (a second, traced run).
+    :return: Dict mapping workload name to {'seconds': float, 'peak_bytes': int or None}.
+    """
+    edges = GENERATORS[generator_name](n_edges, seed=seed)
+    results = {}
+
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        fName = os.path.join(tmp, 'edges.tsv')
+        write_edge_file(edges, fName)
+        del edges
+
+        edge_list, seconds, peak = measure(network.file_to_edge_list, fName, memory=memory)
+        results['file_to_edge_list'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    neighbour_dict, seconds, peak = measure(network.edge_to_neighbour_list_1, edge_list, memory=memory)
+    results['edge_to_neighbour_list_1'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    if len(edge_list) <= MULTI_PASS_MAX_EDGES:
+        _, seconds, peak = measure(network.edge_to_neighbour_list_2, edge_list, memory=memory)
+        results['edge_to_neighbour_list_2'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    _, seconds, peak = measure(network.get_degree_statistics, neighbour_dict, memory=memory)
+    results['get_degree_statistics'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    _, seconds, peak = measure(_clustering_all, neighbour_dict, memory=memory)
+    results['get_clustering_coefficient'] = {'seconds': seconds, 'peak_bytes': peak}
+
+    return results
+
+def run_suite(max_edges=10**5, generators=None, seed=0, memory=False):
+    """
+    Run every workload for every generator at every scale up to max_edges.
+
+    :return: Nested dict results[generator][str(n_edges)][workload] = {'seconds', 'peak_bytes'}.
+    """
+    generators = generators or list(GENERATORS)
+    results = {}
+    for name in generators:
+        results[name] = {}
+        for n_edges in SCALES:
+            if n_edges > max_edges:
+                break
+            results[name][str(n_edges)] = run_workload(name, n_edges, seed=seed, memory=memory)
+    return results
+
+#Baselines.
+def load_baselines(path=DEFAULT_BASELINE_PATH):
+    """
+    Load stored baseline results, or an empty dict if none exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_baselines(results, path=DEFAULT_BASELINE_PATH):
+    """
+    Store results as the new baselines.
+    """
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=4)
+
+def compare_to_baselines(results, baselines, tolerance=0.2):
+    """
+    Compare results against baselines.
+
+    :param tolerance: Fractional slowdown allowed before a workload is flagged.
+    :return: List of (generator, n_edges, workload, seconds, baseline_seconds, ratio, regressed) rows
+        for every workload present in both.
+    """
+    rows = []
+    for name, scales in results.items():
+        for n_edges, workloads in scales.items():
+            for workload, measured in workloads.items():
+                baseline = baselines.get(name, {}).get(n_edges, {}).get(workload)
+                if baseline is None:
+                    continue
+                ratio = measured['seconds'] / baseline['seconds'] if baseline['seconds'] else float('inf')
+                rows.append((name, n_edges, workload, measured['seconds'], baseline['seconds'],
+                             ratio, ratio > 1 + tolerance))
+    return rows
+
+def print_results(results, comparison=None):
+    """
+    Print a table of results, with baseline ratios where available.
+    """
+    ratios = {(name, n, w): (ratio, regressed) for (name, n, w, _, _, ratio, regressed) in (comparison or [])}
+    print(f"{'generator':<20} {'edges':>9} {'workload':<28} {'seconds':>10} {'peak MB':>9} {'vs base':>9}")
+    for name, scales in results.items():
+        for n_edges, workloads in scales.items():
+            for workload, measured in workloads.items():
+                ratio = ratios.get((name, n_edges, workload))
+                ratio_str = f"{ratio[0]:.2f}x{' !' if ratio[1] else ''}" if ratio else '-'
+                peak = measured.get('peak_bytes')
+                peak_str = f"{peak / 2**20:.1f}" if peak is not None else '-'
+                print(f"{name:<20} {n_edges:>9} {workload:<28} {measured['seconds']:>10.4f} "
+                      f"{peak_str:>9} {ratio_str:>9}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark network.py on synthetic graphs.")
+    parser.add_argument('--max-edges', type=int, default=10**5, help="Largest scale to run (up to 10^7).")
+    parser.add_argument('--generator', action='append', choices=list(GENERATORS),
+                        help="Generator to run (repeatable, default all).")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH, help="Baseline JSON path.")
+    parser.add_argument('--save-baseline', action='store_true', help="Store these results as the baselines.")
+    parser.add_argument('--memory', action='store_true',
+                        help="Also record peak memory, with a second traced run of each workload.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed fractional slowdown.")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.max_edges, args.generator, args.seed, args.memory)
+    comparison = compare_to_baselines(results, load_baselines(args.baseline), args.tolerance)
+    print_results(results, comparison)
+
+    if args.save_baseline:
+        save_baselines(results, args.baseline)
+        print(f"\nBaselines saved to {args.baseline}")
+
+    regressions = [row for row in comparison if row[-1]]
+    if regressions:
+        print(f"\n{len(regressions)} workload(s) slower than baseline by more than {args.tolerance:.0%}.")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
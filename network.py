@@ -1,7 +1,24 @@
 #File: network.py
 #Author: Taylor King
 
-from collections import Counter
+import heapq
+import math
+import mmap
+import os
+import random
+import shutil
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+#NumPy is optional: it speeds up the centrality power iterations when installed.
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 def file_to_edge_list(fName):
     """
@@ -16,7 +33,19 @@ def file_to_edge_list(fName):
     Returns:
         list of tuples: Each tuple is (a, b), representing an undirected edge.
     """
-    edge_list = []
+    return list(_iter_edges(fName))
+
+def _iter_edges(fName):
+    """
+    Lazily yield (a, b) integer edges from a TSV file, one line at a time.
+    Blank lines are skipped, exactly as in file_to_edge_list.
+
+    Args:
+        fName (str): Path to the TSV file.
+
+    Yields:
+        tuple: (a, b), representing an undirected edge.
+    """
     with open(fName, 'r') as file:
         for line in file:
             line = line.strip()
@@ -25,10 +54,221 @@ def file_to_edge_list(fName):
                 continue
 
             a_str, b_str = line.split('\t')
-            a, b = int(a_str), int(b_str)
-            edge_list.append((a,b))
+            yield (int(a_str), int(b_str))
+
+#Parallel loading.
+#Large TSV files are split into byte ranges that start and end on line
+#boundaries, and each range is parsed by a worker process into integer arrays.
+def _chunk_boundaries(fName, chunk_bytes):
+    """
+    Return [(start, end), ...] byte ranges covering the file, each ending 
+    just after a newline (or at the end of the file).
+    """
+    size = os.path.getsize(fName)
+    boundaries = []
+    with open(fName, 'rb') as f:
+        start = 0
+        while start < size:
+            end = start + chunk_bytes
+            if end < size:
+                f.seek(end)
+                f.readline() #Move on to the start of the next line.
+                end = f.tell()
+            end = min(end, size)
+            boundaries.append((start, end))
+            start = end
+    return boundaries
+
+def _parse_chunk(fName, start, end):
+    """
+    Parse the lines in one byte range into (sources, dests) integer arrays, 
+    skipping blank lines and raising ValueError on malformed ones, as 
+    file_to_edge_list does.
+    """
+    sources = array('q')
+    dests = array('q')
+    with open(fName, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    for line in data.split(b'\n'):
+        line = line.strip()
+
+        if not line: #If the line is blank then skip this iteration.
+            continue
+
+        a_str, b_str = line.split(b'\t')
+        sources.append(int(a_str))
+        dests.append(int(b_str))
+    return sources, dests
+
+def _map_chunks(func, fName, workers, chunk_bytes):
+    """
+    Apply func(fName, start, end) to every chunk, in a process pool when 
+    there is more than one chunk, and return the results in file order.
+    """
+    boundaries = _chunk_boundaries(fName, chunk_bytes)
+    if len(boundaries) <= 1 or workers == 1:
+        return [func(fName, start, end) for (start, end) in boundaries]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, fName, start, end) for (start, end) in boundaries]
+        return [future.result() for future in futures]
+
+def file_to_edge_arrays(fName, workers=None, chunk_bytes=64 * 2**20):
+    """
+    Read a TSV edge file in parallel into two integer arrays.
+    The file is split into newline-aligned chunks of about `chunk_bytes`, 
+    which are parsed by a pool of `workers` processes (default: one per CPU) 
+    and concatenated in file order.
+
+    Args:
+        fName (str): Path to the TSV file.
+        workers (int, optional): Number of worker processes.
+        chunk_bytes (int): Approximate size of each chunk.
+
+    Returns:
+        tuple: (sources, dests) arrays; edge i is (sources[i], dests[i]).
+
+    Raises:
+        ValueError: If a non-blank line is not two tab-separated integers.
+    """
+    sources = array('q')
+    dests = array('q')
+    for (chunk_sources, chunk_dests) in _map_chunks(_parse_chunk, fName, workers, chunk_bytes):
+        sources.extend(chunk_sources)
+        dests.extend(chunk_dests)
+    return sources, dests
+
+def file_to_edge_list_parallel(fName, workers=None, chunk_bytes=64 * 2**20):
+    """
+    Parallel version of file_to_edge_list, returning the same list of (a, b) tuples.
+    See file_to_edge_arrays for the arguments.
+    """
+    sources, dests = file_to_edge_arrays(fName, workers, chunk_bytes)
+    return list(zip(sources, dests))
+
+def _parse_chunk_to_neighbours(fName, start, end):
+    """
+    Parse one byte range straight into a partial neighbour dictionary.
+    """
+    sources, dests = _parse_chunk(fName, start, end)
+    return edge_to_neighbour_list_1(zip(sources, dests))
+
+def file_to_neighbour_list_parallel(fName, workers=None, chunk_bytes=64 * 2**20):
+    """
+    Build the neighbour dictionary of a TSV edge file in parallel.
+    Each worker builds the neighbour sets for the edges in its chunk, and 
+    the partial dictionaries are merged by set union, giving the same result 
+    as edge_to_neighbour_list_1(file_to_edge_list(fName)).
+    See file_to_edge_arrays for the arguments.
+    """
+    neighbour_dict = {}
+    for partial in _map_chunks(_parse_chunk_to_neighbours, fName, workers, chunk_bytes):
+        for node, neighbours in partial.items():
+            if node in neighbour_dict:
+                neighbour_dict[node] |= neighbours
+            else:
+                neighbour_dict[node] = neighbours
+    return neighbour_dict
+
+#Normalisation.
+#Undirected edges are canonicalised to (min, max) and packed into a single
+#integer key, so one integer sort puts them in order and makes duplicates adjacent.
+NormalisationStats = namedtuple('NormalisationStats', ['input_edges', 'self_loops', 'duplicates', 'output_edges'])
+
+def normalise_edges(sources, dests, remove_self_loops=True):
+    """
+    Canonicalise, deduplicate and sort undirected edges.
+    Each edge becomes (min, max); self-loops are optionally dropped; the 
+    rest are sorted by (a, b) with repeats removed. Uses NumPy's sort when 
+    it is installed, otherwise Python's integer sort.
+
+    Args:
+        sources (sequence of int): First endpoint of each edge.
+        dests (sequence of int): Second endpoint of each edge.
+        remove_self_loops (bool): Whether to drop (a, a) edges.
+
+    Returns:
+        tuple: (sources, dests, stats) where `sources` and `dests` are integer 
+            arrays of the unique edges in ascending (a, b) order with a <= b, 
+            and `stats` is a NormalisationStats of what was removed.
+    """
+    n_input = len(sources)
+    if n_input == 0:
+        return array('q'), array('q'), NormalisationStats(0, 0, 0, 0)
+
+    low = min(min(sources), min(dests))
+    span = max(max(sources), max(dests)) - low + 1
+
+    if np is not None and span * span < 2**63:
+        a = np.asarray(sources, dtype=np.int64) - low
+        b = np.asarray(dests, dtype=np.int64) - low
+        lo, hi = np.minimum(a, b), np.maximum(a, b)
+        loops = lo == hi
+        n_loops = int(loops.sum())
+        if remove_self_loops:
+            lo, hi = lo[~loops], hi[~loops]
+        keys = np.unique(lo * span + hi)
+        out_sources = array('q', (keys // span + low).tolist())
+        out_dests = array('q', (keys % span + low).tolist())
+    else:
+        n_loops = 0
+        keys = []
+        for a, b in zip(sources, dests):
+            if a == b:
+                n_loops += 1
+                if remove_self_loops:
+                    continue
+            if a > b:
+                a, b = b, a
+            keys.append((a - low) * span + (b - low))
+        keys = sorted(set(keys))
+        out_sources = array('q', (key // span + low for key in keys))
+        out_dests = array('q', (key % span + low for key in keys))
+
+    n_removed_loops = n_loops if remove_self_loops else 0
+    n_output = len(out_sources)
+    stats = NormalisationStats(n_input, n_removed_loops, n_input - n_removed_loops - n_output, n_output)
+    return out_sources, out_dests, stats
+
+def normalise_edge_list(edge_list, remove_self_loops=True):
+    """
+    normalise_edges for a list of (a, b) tuples.
+
+    Args:
+        edge_list (list of tuples): The (a, b) edges to normalise.
+        remove_self_loops (bool): Whether to drop (a, a) edges.
+
+    Returns:
+        tuple: (edge_list, stats), with the edges as a sorted list of unique (a, b) tuples, a <= b, 
+            and `stats` a NormalisationStats of what was removed.
+    """
+    sources = array('q', (a for (a, _) in edge_list))
+    dests = array('q', (b for (_, b) in edge_list))
+    sources, dests, stats = normalise_edges(sources, dests, remove_self_loops)
+    return list(zip(sources, dests)), stats
+
+def file_to_normalised_edges(fName, remove_self_loops=True, workers=1):
+    """
+    Load a TSV edge file and normalise it in one step, see normalise_edges.
+    With `workers` other than 1 the file is parsed with file_to_edge_arrays.
+
+    Args:
+        fName (str): Path to the TSV file.
+        remove_self_loops (bool): Whether to drop (a, a) edges.
+        workers (int): Number of parsing processes; 1 parses in this process, None uses every CPU.
 
-    return edge_list
+    Returns:
+        tuple: (sources, dests, stats) as returned by normalise_edges.
+    """
+    if workers == 1:
+        sources, dests = array('q'), array('q')
+        for (a, b) in _iter_edges(fName):
+            sources.append(a)
+            dests.append(b)
+    else:
+        sources, dests = file_to_edge_arrays(fName, workers)
+    return normalise_edges(sources, dests, remove_self_loops)
 
 def edge_to_neighbour_list_1(edge_list):
     """
@@ -102,6 +342,7 @@ def inspect_node(*, network, node):
     Args:
         network (dict or list of tuples): The network representation, 
             either as an adjacency dictionary (neighbor list) or an edge list.
+            A BitsetAdjacency, CompactAdjacency or DiskAdjacency is treated like a neighbor list.
         node (int): The node to inspect.
 
     Returns:
@@ -115,6 +356,17 @@ def inspect_node(*, network, node):
     if isinstance(network, dict):
         #Return set of neighbors if node exists, otherwise an empty set is returned.
         return network[node] if node in network else set()
+    elif isinstance(network, BitsetAdjacency):
+        return network.neighbours(node)
+    elif isinstance(network, CompactAdjacency):
+        if node not in network.index:
+            return set()
+        return {network.nodes[v] for v in _compact_neighbour_ids(network, node)}
+    elif isinstance(network, DiskAdjacency):
+        return set(network._neighbour_view(node))
+    elif isinstance(network, IndexedEdgeList):
+        #Indexed edge list: O(degree) lookup instead of a full scan.
+        return network.edges_of(node)
     else:
         #Meaning an edge list: gather edges that contain 'node'.
         result = []
@@ -124,6 +376,127 @@ def inspect_node(*, network, node):
 
         return result
 
+def inspect_nodes(*, network, nodes):
+    """
+    Batched version of inspect_node for many queries against one network.
+    For a neighbour list each query is a dictionary lookup. For an edge 
+    list, a per-node index is built once (or reused, for an IndexedEdgeList) 
+    so the whole batch costs O(E + total degree) rather than O(E) per node.
+
+    Args:
+        network (dict or list of tuples): The network representation, 
+            either as an adjacency dictionary (neighbor list) or an edge list.
+        nodes (iterable of int): The nodes to inspect.
+
+    Returns:
+        dict: Maps each queried node to what inspect_node would return for it.
+    """
+    if not isinstance(network, (dict, IndexedEdgeList)):
+        #Plain edge list: index it once for the whole batch.
+        network = IndexedEdgeList(network)
+
+    return {node: inspect_node(network=network, node=node) for node in nodes}
+
+class IndexedEdgeList(list):
+    """
+    An edge list (list of (a, b) tuples) that answers per-node queries quickly.
+    The per-node index is built lazily on the first query and then kept in 
+    step with append and extend. Any other mutation (insert, remove, slicing 
+    assignment, sort, ...) simply drops the index so it is rebuilt on the 
+    next query. Being a list, it can be passed anywhere an edge list is expected.
+    """
+    def __init__(self, edges=()):
+        super().__init__(edges)
+        self._index = None
+
+    def _build_index(self):
+        """
+        Build the node -> incident edges index in a single pass over the edges.
+        """
+        self._index = {}
+        for edge in self:
+            self._index_edge(edge)
+
+    def _index_edge(self, edge):
+        """
+        Record a single edge under both of its endpoints.
+        """
+        a, b = edge
+        self._index.setdefault(a, []).append(edge)
+        if b != a: #A self-loop is listed only once.
+            self._index.setdefault(b, []).append(edge)
+
+    def _invalidate(self):
+        self._index = None
+
+    def edges_of(self, node):
+        """
+        Return the edges containing `node`, in their original order.
+
+        Args:
+            node (int): The node to look up.
+
+        Returns:
+            list: A new list of edge tuples, empty if the node is absent.
+        """
+        if self._index is None:
+            self._build_index()
+        return list(self._index.get(node, ()))
+
+    def append(self, edge):
+        super().append(edge)
+        if self._index is not None:
+            self._index_edge(edge)
+
+    def extend(self, edges):
+        edges = list(edges)
+        super().extend(edges)
+        if self._index is not None:
+            for edge in edges:
+                self._index_edge(edge)
+
+    def __iadd__(self, edges):
+        self.extend(edges)
+        return self
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._invalidate()
+        return result
+
+    def insert(self, i, edge):
+        super().insert(i, edge)
+        self._invalidate()
+
+    def remove(self, edge):
+        super().remove(edge)
+        self._invalidate()
+
+    def pop(self, i=-1):
+        edge = super().pop(i)
+        self._invalidate()
+        return edge
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._invalidate()
+
+    def reverse(self):
+        super().reverse()
+        self._invalidate()
+
 def get_degree_statistics(neighbour_dict):
     """
     Compute degree-related statistics from a neighbor list.
@@ -132,7 +505,7 @@ def get_degree_statistics(neighbour_dict):
     the node degrees.
 
     Args:
-        neighbour_dict (dict): A dictionary where keys are nodes and 
+        neighbour_dict (dict, BitsetAdjacency, CompactAdjacency or DiskAdjacency): A dictionary where keys are nodes and 
             values are sets of neighboring nodes.
 
     Returns:
@@ -144,13 +517,35 @@ def get_degree_statistics(neighbour_dict):
         
         If `neighbour_dict` is empty, returns (0, 0, 0.0, 0).
     """
+    if isinstance(neighbour_dict, DiskAdjacency):
+        return neighbour_dict.degree_statistics()
+
+    #Calculate each node's degree.
+    if isinstance(neighbour_dict, BitsetAdjacency):
+        degrees = [bits.bit_count() for bits in neighbour_dict.bits]
+    elif isinstance(neighbour_dict, CompactAdjacency):
+        offsets = neighbour_dict.offsets
+        degrees = [offsets[i + 1] - offsets[i] for i in range(len(neighbour_dict.nodes))]
+    else:
+        degrees = [len(neighbour_dict[node]) for node in neighbour_dict]
+
     #If empty
-    if not neighbour_dict:
+    if not degrees:
         return (0, 0, 0.0, 0)
 
-    #Calculate each node's degree.
-    degrees = [len(neighbour_dict[node]) for node in neighbour_dict]
+    return _summarise_degrees(degrees)
 
+def _summarise_degrees(degrees):
+    """
+    Reduce a non-empty sequence of node degrees to the statistics tuple 
+    returned by get_degree_statistics.
+
+    Args:
+        degrees (list of int): The degree of every node.
+
+    Returns:
+        tuple: (max_degree, min_degree, average_degree, most_common_degree).
+    """
     max_degree = max(degrees)
     min_degree = min(degrees)
     #Use a lambda for average
@@ -163,6 +558,60 @@ def get_degree_statistics(neighbour_dict):
 
     return (max_degree, min_degree, avg_degree, most_common_deg)
 
+def _summarise_degree_counts(count):
+    """
+    Same as _summarise_degrees, but from a non-empty Counter mapping each 
+    degree to how many nodes have it (in order of first appearance), so the 
+    individual degrees never need to be held in memory.
+    """
+    n_nodes = sum(count.values())
+    avg_degree = sum(degree * n for degree, n in count.items()) / n_nodes
+    return (max(count), min(count), avg_degree, count.most_common(1)[0][0])
+
+def get_degree_statistics_from_file(fName, deduplicate=False):
+    """
+    Compute degree statistics directly from a TSV edge file.
+    The file is streamed once and only a per-node degree counter is kept, 
+    so neither the edge list nor the neighbour sets are ever built. 
+
+    With `deduplicate` enabled, repeated undirected edges ((a, b) appearing 
+    again as (a, b) or (b, a)) are only counted once and a self-loop adds 
+    one to its node's degree, so the result matches 
+    get_degree_statistics(edge_to_neighbour_list_1(file_to_edge_list(fName))).
+    This needs a set of the unique edges seen so far. With it disabled, 
+    every line counts towards the degrees of its endpoints and memory 
+    is only proportional to the number of nodes.
+
+    Args:
+        fName (str): Path to the TSV file.
+        deduplicate (bool): Whether to ignore repeated undirected edges.
+
+    Returns:
+        tuple: (max_degree, min_degree, average_degree, most_common_degree).
+        
+        If the file has no edges, returns (0, 0, 0.0, 0).
+    """
+    degree_count = Counter()
+    seen = set()
+
+    for (a, b) in _iter_edges(fName):
+        if deduplicate:
+            #Canonicalise the undirected edge so (a, b) and (b, a) match.
+            key = (a, b) if a <= b else (b, a)
+            if key in seen:
+                continue
+            seen.add(key)
+
+        degree_count[a] += 1
+        if b != a: #A self-loop only adds the node to its own set once.
+            degree_count[b] += 1
+
+    #If empty
+    if not degree_count:
+        return (0, 0, 0.0, 0)
+
+    return _summarise_degrees(list(degree_count.values()))
+
 def get_clustering_coefficient(*, network, node):
     """
     Compute the clustering coefficient for a given node.
@@ -178,17 +627,25 @@ def get_clustering_coefficient(*, network, node):
     If the node has fewer than 2 neighbors, the clustering coefficient is 0.0.
 
     Args:
-        network (dict): A dictionary where each node maps to a set of its neighbors.
+        network (dict, BitsetAdjacency, CompactAdjacency or DiskAdjacency): A dictionary where each node maps to a set of its neighbors.
         node (int): The node for which to calculate the clustering coefficient.
 
     Returns:
         float: The clustering coefficient for the node (between 0.0 and 1.0).
             Returns 0.0 if the node is missing or has fewer than 2 neighbors.
     """
+    if isinstance(network, CompactAdjacency):
+        return _compact_clustering(network, node) if node in network.index else 0.0
+    if isinstance(network, DiskAdjacency):
+        return network.clustering_coefficient(node)
+
     # If node is missing, 0.0.
     if node not in network:
         return 0.0
 
+    if isinstance(network, BitsetAdjacency):
+        return _bitset_clustering(network, node)
+
     neighbors = network[node]
     k = len(neighbors)
     #If fewer than 2 neighbors, coefficient is 0.0.
@@ -215,3 +672,1651 @@ def get_clustering_coefficient(*, network, node):
     C = numerator / denominator
 
     return C
+
+#Approximate clustering.
+#Each estimate is the mean of independent samples bounded in [0, 1], so
+#Hoeffding's inequality gives the number of samples needed for a target
+#error and confidence, and the error actually achieved by a given sample size.
+ClusteringEstimate = namedtuple('ClusteringEstimate', ['estimate', 'error', 'confidence', 'samples'])
+
+def _hoeffding_samples(epsilon, confidence):
+    """
+    Number of samples needed so the sample mean is within epsilon of the 
+    true mean with the given confidence.
+    """
+    if not 0 < epsilon < 1:
+        raise ValueError("epsilon must be between 0 and 1.")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1.")
+    return math.ceil(math.log(2 / (1 - confidence)) / (2 * epsilon ** 2))
+
+def _hoeffding_error(samples, confidence):
+    """
+    Error bound achieved by `samples` samples at the given confidence.
+    """
+    return math.sqrt(math.log(2 / (1 - confidence)) / (2 * samples))
+
+def _sample_wedge_closed(network, node, neighbour_lists, rng):
+    """
+    Pick a uniformly random pair of distinct neighbours of `node` and 
+    report whether they are connected, i.e. whether the wedge is closed.
+    """
+    neighbours = neighbour_lists.get(node)
+    if neighbours is None:
+        neighbours = neighbour_lists[node] = list(network[node])
+    k = len(neighbours)
+    i = rng.randrange(k)
+    j = rng.randrange(k - 1)
+    if j >= i:
+        j += 1
+    return neighbours[j] in network.get(neighbours[i], ())
+
+def estimate_clustering_coefficient(*, network, node, epsilon=0.01, confidence=0.95, seed=None):
+    """
+    Estimate the clustering coefficient of a single node by sampling pairs 
+    of its neighbours and checking whether each pair is connected.
+    Intended for high-degree nodes, where get_clustering_coefficient has to 
+    check all k * (k - 1) / 2 pairs. If that is no more than the number of 
+    samples needed, the exact coefficient is returned with an error of 0.0.
+
+    Args:
+        network (dict): A dictionary where each node maps to a set of its neighbors.
+        node (int): The node for which to estimate the clustering coefficient.
+        epsilon (float): Target maximum absolute error.
+        confidence (float): Probability that the error is within `epsilon`.
+        seed (int, optional): Seed for the random number generator.
+
+    Returns:
+        ClusteringEstimate: (estimate, error, confidence, samples), where 
+            `error` is the bound achieved at `confidence` with `samples` samples.
+    """
+    samples = _hoeffding_samples(epsilon, confidence)
+    k = len(network.get(node, ()))
+    if k * (k - 1) // 2 <= samples:
+        exact = get_clustering_coefficient(network=network, node=node)
+        return ClusteringEstimate(exact, 0.0, confidence, 0)
+
+    rng = random.Random(seed)
+    neighbour_lists = {}
+    closed = sum(_sample_wedge_closed(network, node, neighbour_lists, rng) for _ in range(samples))
+    return ClusteringEstimate(closed / samples, _hoeffding_error(samples, confidence), confidence, samples)
+
+def estimate_transitivity(network, epsilon=0.01, confidence=0.95, seed=None):
+    """
+    Estimate the global clustering coefficient (transitivity) by wedge sampling.
+    Transitivity is the fraction of wedges (paths a - b - c) that are closed 
+    into triangles. A wedge is sampled uniformly by picking its centre with 
+    probability proportional to k * (k - 1) / 2 and then a random pair of the 
+    centre's neighbours.
+
+    Args:
+        network (dict): A dictionary where each node maps to a set of its neighbors.
+        epsilon (float): Target maximum absolute error.
+        confidence (float): Probability that the error is within `epsilon`.
+        seed (int, optional): Seed for the random number generator.
+
+    Returns:
+        ClusteringEstimate: (estimate, error, confidence, samples).
+            Returns an estimate of 0.0 with no error if the network has no wedges.
+    """
+    samples = _hoeffding_samples(epsilon, confidence)
+    centres = []
+    cum_weights = []
+    total = 0
+    for node, neighbours in network.items():
+        k = len(neighbours)
+        if k >= 2:
+            total += k * (k - 1) // 2
+            centres.append(node)
+            cum_weights.append(total)
+
+    if not centres:
+        return ClusteringEstimate(0.0, 0.0, confidence, 0)
+
+    rng = random.Random(seed)
+    neighbour_lists = {}
+    closed = 0
+    for centre in rng.choices(centres, cum_weights=cum_weights, k=samples):
+        closed += _sample_wedge_closed(network, centre, neighbour_lists, rng)
+    return ClusteringEstimate(closed / samples, _hoeffding_error(samples, confidence), confidence, samples)
+
+def estimate_average_clustering(network, epsilon=0.01, confidence=0.95, seed=None):
+    """
+    Estimate the average of get_clustering_coefficient over all nodes.
+    Each sample picks a node uniformly at random and then one random wedge 
+    centred on it; the fraction of closed wedges is an unbiased estimate of 
+    the average clustering coefficient. Nodes with fewer than 2 neighbours 
+    count as 0.0, as in get_clustering_coefficient.
+
+    Args:
+        network (dict): A dictionary where each node maps to a set of its neighbors.
+        epsilon (float): Target maximum absolute error.
+        confidence (float): Probability that the error is within `epsilon`.
+        seed (int, optional): Seed for the random number generator.
+
+    Returns:
+        ClusteringEstimate: (estimate, error, confidence, samples).
+            Returns an estimate of 0.0 with no error if the network is empty.
+    """
+    samples = _hoeffding_samples(epsilon, confidence)
+    if not network:
+        return ClusteringEstimate(0.0, 0.0, confidence, 0)
+
+    rng = random.Random(seed)
+    nodes = list(network)
+    neighbour_lists = {}
+    closed = 0
+    for _ in range(samples):
+        node = nodes[rng.randrange(len(nodes))]
+        if len(network[node]) >= 2:
+            closed += _sample_wedge_closed(network, node, neighbour_lists, rng)
+    return ClusteringEstimate(closed / samples, _hoeffding_error(samples, confidence), confidence, samples)
+
+#Traversal.
+#A CompactAdjacency stores the graph in compressed sparse row form: nodes are
+#numbered 0..N-1, and the neighbours of node i are
+#targets[offsets[i]:offsets[i + 1]]. Integer arrays keep this far smaller
+#than a dict of sets on large graphs.
+CompactAdjacency = namedtuple('CompactAdjacency', ['nodes', 'index', 'offsets', 'targets'])
+
+def to_compact_adjacency(neighbour_dict, order=None):
+    """
+    Convert a neighbour list into array-backed (CSR) adjacency.
+    Each node's neighbours are stored in ascending compact id order.
+
+    Args:
+        neighbour_dict (dict): A dictionary mapping each node to a set of its neighbors.
+        order (str, optional): Relabel nodes for cache locality, see relabel_compact_adjacency.
+
+    Returns:
+        CompactAdjacency: (nodes, index, offsets, targets), where `nodes` lists 
+            the original node ids by compact id, `index` maps an original id 
+            to its compact id, and `offsets` / `targets` are integer arrays.
+    """
+    nodes = list(neighbour_dict)
+    index = {node: i for i, node in enumerate(nodes)}
+    offsets = array('q', [0])
+    targets = array('q')
+    for node in nodes:
+        targets.extend(sorted(index[v] for v in neighbour_dict[node]))
+        offsets.append(len(targets))
+    adjacency = CompactAdjacency(nodes, index, offsets, targets)
+    return relabel_compact_adjacency(adjacency, order) if order else adjacency
+
+def file_to_compact_adjacency(fName, order=None):
+    """
+    Read a TSV edge file straight into compact adjacency.
+    External node ids (which may be sparse, large integers) are mapped to 
+    dense ids 0..N-1 as they are first seen, so no dict of sets is built: 
+    edges are held in two integer arrays and placed into CSR form with a 
+    counting sort on degree. Repeated edges are dropped, as in 
+    edge_to_neighbour_list_1. The mapping is kept in the result's `nodes` 
+    and `index` fields, and functions given the result take and return 
+    external ids.
+
+    Args:
+        fName (str): Path to the TSV file.
+        order (str, optional): Relabel nodes for cache locality, see relabel_compact_adjacency.
+
+    Returns:
+        CompactAdjacency: The graph, with `nodes[i]` the external id of dense id i.
+    """
+    nodes = []
+    index = {}
+    sources = array('q')
+    dests = array('q')
+    for (a, b) in _iter_edges(fName):
+        for node in (a, b):
+            if node not in index:
+                index[node] = len(nodes)
+                nodes.append(node)
+        sources.append(index[a])
+        dests.append(index[b])
+
+    #Count each endpoint, then turn the counts into CSR offsets.
+    n = len(nodes)
+    counts = array('q', [0]) * (n + 1)
+    for i in range(len(sources)):
+        counts[sources[i] + 1] += 1
+        counts[dests[i] + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+
+    fill = array('q', counts)
+    raw = array('q', [0]) * counts[n]
+    for i in range(len(sources)):
+        u, v = sources[i], dests[i]
+        raw[fill[u]] = v
+        fill[u] += 1
+        raw[fill[v]] = u
+        fill[v] += 1
+    del sources, dests, fill
+
+    #Sort and deduplicate each neighbour run.
+    offsets = array('q', [0])
+    targets = array('q')
+    for u in range(n):
+        targets.extend(sorted(set(raw[counts[u]:counts[u + 1]])))
+        offsets.append(len(targets))
+
+    adjacency = CompactAdjacency(nodes, index, offsets, targets)
+    return relabel_compact_adjacency(adjacency, order) if order else adjacency
+
+def relabel_compact_adjacency(adjacency, order):
+    """
+    Renumber the dense ids of a CompactAdjacency so that nodes likely to be 
+    visited together sit close together in memory.
+
+    Args:
+        adjacency (CompactAdjacency): The graph to relabel.
+        order (str): 'degree' puts nodes in descending degree order (hubs 
+            first); 'bfs' numbers nodes in breadth-first order, component by 
+            component, so neighbours tend to get nearby ids.
+
+    Returns:
+        CompactAdjacency: A new, equivalent graph using the new numbering.
+
+    Raises:
+        ValueError: If `order` is not 'degree' or 'bfs'.
+    """
+    offsets, targets = adjacency.offsets, adjacency.targets
+    n = len(adjacency.nodes)
+
+    if order == 'degree':
+        new_to_old = sorted(range(n), key=lambda u: offsets[u] - offsets[u + 1])
+    elif order == 'bfs':
+        new_to_old = []
+        dist = array('q', [-1]) * n
+        for start in range(n):
+            if dist[start] < 0:
+                new_to_old.extend(_bfs_compact(adjacency, start, dist))
+    else:
+        raise ValueError("order must be 'degree' or 'bfs'.")
+
+    old_to_new = array('q', [0]) * n
+    for new, old in enumerate(new_to_old):
+        old_to_new[old] = new
+
+    nodes = [adjacency.nodes[old] for old in new_to_old]
+    index = {node: i for i, node in enumerate(nodes)}
+    new_offsets = array('q', [0])
+    new_targets = array('q')
+    for old in new_to_old:
+        new_targets.extend(sorted(old_to_new[v] for v in targets[offsets[old]:offsets[old + 1]]))
+        new_offsets.append(len(new_targets))
+    return CompactAdjacency(nodes, index, new_offsets, new_targets)
+
+def _compact_neighbour_ids(adjacency, node):
+    """
+    Return the dense neighbour ids of external `node` as an array slice.
+    """
+    i = adjacency.index[node]
+    return adjacency.targets[adjacency.offsets[i]:adjacency.offsets[i + 1]]
+
+def _compact_clustering(adjacency, node):
+    """
+    Clustering coefficient of external `node` over compact adjacency.
+    """
+    offsets, targets = adjacency.offsets, adjacency.targets
+    i = adjacency.index[node]
+    neighbours = set(_compact_neighbour_ids(adjacency, node))
+    k = len(neighbours)
+    if k < 2:
+        return 0.0
+
+    twice_E_N = 0
+    for v in neighbours:
+        for w in targets[offsets[v]:offsets[v + 1]]:
+            if w != v and w in neighbours: #A self-loop on v is not a neighbour pair.
+                twice_E_N += 1
+    return twice_E_N / (k * (k - 1))
+
+def _bfs_compact(adjacency, source_id, dist):
+    """
+    Level-synchronous BFS over compact adjacency from compact id `source_id`.
+    Fills `dist` (an array of -1 for unvisited) in place and returns the 
+    compact ids visited, in BFS order.
+    """
+    offsets, targets = adjacency.offsets, adjacency.targets
+    dist[source_id] = 0
+    order = [source_id]
+    frontier = [source_id]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for u in frontier:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if dist[v] < 0:
+                    dist[v] = depth
+                    next_frontier.append(v)
+        order.extend(next_frontier)
+        frontier = next_frontier
+    return order
+
+def _bfs_dict(neighbour_dict, source):
+    """
+    Level-synchronous BFS over a neighbour list. Returns {node: hops}.
+    """
+    dist = {source: 0}
+    frontier = [source]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for u in frontier:
+            for v in neighbour_dict.get(u, ()):
+                if v not in dist:
+                    dist[v] = depth
+                    next_frontier.append(v)
+        frontier = next_frontier
+    return dist
+
+def bfs_distances(*, network, source):
+    """
+    Compute the hop distance from `source` to every node reachable from it.
+    The search expands one frontier (level) at a time, so it needs no 
+    recursion and each node is visited exactly once.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        source (int): The node to start from.
+
+    Returns:
+        dict: Maps each reachable node (including `source`) to its hop distance.
+            Returns an empty dict if `source` is not in the network.
+    """
+    if isinstance(network, CompactAdjacency):
+        if source not in network.index:
+            return {}
+        dist = array('q', [-1]) * len(network.nodes)
+        order = _bfs_compact(network, network.index[source], dist)
+        return {network.nodes[i]: dist[i] for i in order}
+
+    if source not in network:
+        return {}
+    return _bfs_dict(network, source)
+
+def shortest_path_length(*, network, source, target):
+    """
+    Return the number of hops on a shortest path between two nodes, 
+    or None if `target` cannot be reached from `source`.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        source (int): Start node.
+        target (int): End node.
+
+    Returns:
+        int or None: The hop distance.
+    """
+    return bfs_distances(network=network, source=source).get(target)
+
+def connected_components(network):
+    """
+    Find the connected components of a network by repeated BFS.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+
+    Returns:
+        list of sets: One set of nodes per component, largest first.
+    """
+    components = []
+    if isinstance(network, CompactAdjacency):
+        dist = array('q', [-1]) * len(network.nodes)
+        for start in range(len(network.nodes)):
+            if dist[start] < 0:
+                order = _bfs_compact(network, start, dist)
+                components.append({network.nodes[i] for i in order})
+    else:
+        seen = set()
+        for start in network:
+            if start not in seen:
+                component = set(_bfs_dict(network, start))
+                seen |= component
+                components.append(component)
+
+    components.sort(key=len, reverse=True)
+    return components
+
+class _DisjointSet:
+    """
+    Union-find over arbitrary hashable nodes, with union by size and path halving.
+    """
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, node):
+        parent = self.parent
+        if node not in parent:
+            parent[node] = node
+            self.size[node] = 1
+            return node
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+def connected_components_from_file(fName):
+    """
+    Find connected components while streaming a TSV edge file.
+    Edges are merged into a union-find structure as they are read, so 
+    neither the edge list nor the neighbour list is ever built.
+
+    Args:
+        fName (str): Path to the TSV file.
+
+    Returns:
+        list of sets: One set of nodes per component, largest first.
+    """
+    disjoint_set = _DisjointSet()
+    for (a, b) in _iter_edges(fName):
+        disjoint_set.union(a, b)
+
+    groups = {}
+    for node in disjoint_set.parent:
+        groups.setdefault(disjoint_set.find(node), set()).add(node)
+
+    return sorted(groups.values(), key=len, reverse=True)
+
+def approximate_diameter(network, sweeps=4, seed=None):
+    """
+    Estimate the diameter (longest shortest path) with repeated double sweeps.
+    Each sweep runs a BFS from a random node, then another BFS from the 
+    farthest node found; the largest distance seen is a lower bound on the 
+    diameter that is exact on trees and usually tight in practice. 
+    Only `2 * sweeps` BFS runs are needed rather than one per node.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        sweeps (int): Number of double sweeps to run.
+        seed (int, optional): Seed for choosing the start nodes.
+
+    Returns:
+        int: A lower bound on the diameter. Returns 0 for an empty network.
+    """
+    nodes = network.nodes if isinstance(network, CompactAdjacency) else list(network)
+    if not nodes:
+        return 0
+
+    rng = random.Random(seed)
+    best = 0
+    for _ in range(sweeps):
+        dist = bfs_distances(network=network, source=rng.choice(nodes))
+        far_node = max(dist, key=dist.get)
+        dist = bfs_distances(network=network, source=far_node)
+        best = max(best, max(dist.values()))
+    return best
+
+#Bitset adjacency.
+#For dense graphs each node's neighbours are stored as the bits of one Python
+#int over compact node ids. Intersecting two neighbourhoods is then a single
+#AND over machine words, and counting the result is a popcount (int.bit_count).
+
+#Density (fraction of possible edges present) above which edge_to_adjacency picks bitsets.
+DENSE_THRESHOLD = 0.1
+
+class BitsetAdjacency:
+    """
+    Dense-graph adjacency: `bits[i]` has bit j set when compact nodes i and j 
+    are neighbours. `nodes` lists the original node ids by compact id and 
+    `index` maps them back. Supports `in`, `len` and iteration over nodes 
+    like a neighbour dict, so it can be passed to inspect_node, 
+    get_degree_statistics and get_clustering_coefficient.
+    """
+    def __init__(self, neighbour_dict):
+        """
+        Build the bitsets from a neighbour list.
+
+        Args:
+            neighbour_dict (dict): A dictionary mapping each node to a set of its neighbors.
+        """
+        self.nodes = list(neighbour_dict)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.bits = []
+        n_bytes = (len(self.nodes) + 7) // 8
+        for node in self.nodes:
+            #Set bits in a byte buffer, then convert once, rather than OR-ing into a growing int.
+            buffer = bytearray(n_bytes)
+            for v in neighbour_dict[node]:
+                j = self.index[v]
+                buffer[j >> 3] |= 1 << (j & 7)
+            self.bits.append(int.from_bytes(buffer, 'little'))
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def degree(self, node):
+        """
+        Return the degree of `node` (0 if it is absent).
+        """
+        i = self.index.get(node)
+        return 0 if i is None else self.bits[i].bit_count()
+
+    def neighbours(self, node):
+        """
+        Return the set of neighbours of `node` (empty if it is absent).
+        """
+        i = self.index.get(node)
+        if i is None:
+            return set()
+        result = set()
+        bits = self.bits[i]
+        while bits:
+            low = bits & -bits
+            result.add(self.nodes[low.bit_length() - 1])
+            bits ^= low
+        return result
+
+    def common_neighbour_count(self, u, v):
+        """
+        Return the number of neighbours shared by `u` and `v`.
+        """
+        if u not in self.index or v not in self.index:
+            return 0
+        return (self.bits[self.index[u]] & self.bits[self.index[v]]).bit_count()
+
+def _bitset_clustering(network, node):
+    """
+    Clustering coefficient of `node` over a BitsetAdjacency. For each 
+    neighbour v, the edges from v into the neighbourhood are counted with 
+    one AND and one popcount; every such edge is seen from both ends.
+    """
+    i = network.index[node]
+    neighbourhood = network.bits[i]
+    k = neighbourhood.bit_count()
+    if k < 2:
+        return 0.0
+
+    twice_E_N = 0
+    bits = neighbourhood
+    while bits:
+        low = bits & -bits
+        j = low.bit_length() - 1
+        inner = network.bits[j] & neighbourhood
+        #A self-loop on j is not an edge between two distinct neighbours.
+        twice_E_N += inner.bit_count() - ((inner >> j) & 1)
+        bits ^= low
+
+    return twice_E_N / (k * (k - 1))
+
+def get_density(neighbour_dict):
+    """
+    Return the fraction of possible undirected edges present in a neighbour list.
+    Returns 0.0 for networks with fewer than 2 nodes.
+    """
+    n = len(neighbour_dict)
+    if n < 2:
+        return 0.0
+    twice_edges = sum(len(neighbours) for neighbours in neighbour_dict.values())
+    return twice_edges / (n * (n - 1))
+
+def edge_to_adjacency(edge_list, density_threshold=DENSE_THRESHOLD):
+    """
+    Build the best adjacency for an edge list: a BitsetAdjacency when the 
+    graph's density is at least `density_threshold`, otherwise the usual 
+    neighbour dictionary from edge_to_neighbour_list_1.
+
+    Args:
+        edge_list (list of tuples): Each tuple is (a, b), representing an undirected edge.
+        density_threshold (float): Density at or above which bitsets are used.
+
+    Returns:
+        dict or BitsetAdjacency: The adjacency structure.
+    """
+    neighbour_dict = edge_to_neighbour_list_1(edge_list)
+    if neighbour_dict and get_density(neighbour_dict) >= density_threshold:
+        return BitsetAdjacency(neighbour_dict)
+    return neighbour_dict
+
+#Memoised metrics.
+class MemoisedNetwork:
+    """
+    Wraps a neighbour dictionary and caches get_clustering_coefficient and 
+    get_degree_statistics results between calls. Edges must be added and 
+    removed through add_edge / remove_edge so that only the affected cache 
+    entries are invalidated: the two endpoints and their common neighbours 
+    for clustering, and the degree statistics. The clustering cache holds 
+    at most `max_size` nodes, evicting the least recently used.
+    """
+    def __init__(self, neighbour_dict=None, max_size=100000):
+        """
+        Args:
+            neighbour_dict (dict, optional): A dictionary mapping each node to a set of its neighbors (wrapped, not copied).
+            max_size (int): Maximum number of cached clustering coefficients.
+        """
+        self.network = neighbour_dict if neighbour_dict is not None else {}
+        self.max_size = max_size
+        self._clustering = OrderedDict()
+        self._degree_stats = None
+        self.hits = 0
+        self.misses = 0
+
+    def clustering_coefficient(self, node):
+        """
+        Return the clustering coefficient of `node`, from the cache if possible.
+        """
+        if node in self._clustering:
+            self.hits += 1
+            self._clustering.move_to_end(node)
+            return self._clustering[node]
+
+        self.misses += 1
+        value = get_clustering_coefficient(network=self.network, node=node)
+        self._clustering[node] = value
+        if len(self._clustering) > self.max_size:
+            self._clustering.popitem(last=False)
+        return value
+
+    def degree_statistics(self):
+        """
+        Return get_degree_statistics for the network, from the cache if possible.
+        """
+        if self._degree_stats is not None:
+            self.hits += 1
+            return self._degree_stats
+
+        self.misses += 1
+        self._degree_stats = get_degree_statistics(self.network)
+        return self._degree_stats
+
+    def _invalidate_edge(self, a, b):
+        """
+        Drop every cached value that the edge (a, b) can affect.
+        """
+        self._degree_stats = None
+        for node in (a, b):
+            self._clustering.pop(node, None)
+        #Common neighbours gain or lose an edge between two of their neighbours.
+        for node in self.network.get(a, set()) & self.network.get(b, set()):
+            self._clustering.pop(node, None)
+
+    def add_edge(self, a, b):
+        """
+        Add the undirected edge (a, b), creating either node if needed.
+        """
+        if b in self.network.get(a, ()):
+            return
+        self._invalidate_edge(a, b)
+        self.network.setdefault(a, set()).add(b)
+        self.network.setdefault(b, set()).add(a)
+
+    def remove_edge(self, a, b):
+        """
+        Remove the undirected edge (a, b). Both nodes stay in the network.
+
+        Raises:
+            KeyError: If the edge is not present.
+        """
+        if b not in self.network.get(a, ()):
+            raise KeyError((a, b))
+        self._invalidate_edge(a, b)
+        self.network[a].discard(b)
+        self.network[b].discard(a)
+
+    def cache_info(self):
+        """
+        Return (hits, misses, cached clustering entries, max_size).
+        """
+        return (self.hits, self.misses, len(self._clustering), self.max_size)
+
+#Link prediction.
+#Similarity of two nodes from their shared neighbours. Scoring works on
+#CompactAdjacency, whose neighbour runs are sorted, so shared neighbours are
+#found by merging two sorted arrays instead of building Python sets.
+LINK_SCORES = ('common_neighbours', 'jaccard', 'adamic_adar')
+
+def _intersect_sorted(a, b):
+    """
+    Return the values common to two ascending integer sequences.
+    When one is much shorter, each of its values is binary searched in the 
+    longer one; otherwise the two are merged in a single linear pass.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return []
+
+    if len(a) * 8 < len(b):
+        common = []
+        lo = 0
+        for x in a:
+            lo = bisect_left(b, x, lo)
+            if lo == len(b):
+                break
+            if b[lo] == x:
+                common.append(x)
+        return common
+
+    common = []
+    i = j = 0
+    len_a, len_b = len(a), len(b)
+    while i < len_a and j < len_b:
+        x, y = a[i], b[j]
+        if x == y:
+            common.append(x)
+            i += 1
+            j += 1
+        elif x < y:
+            i += 1
+        else:
+            j += 1
+    return common
+
+def _link_score(adjacency, method, u, v):
+    """
+    Score one pair of dense ids with the given method.
+    """
+    offsets, targets = adjacency.offsets, adjacency.targets
+    a = targets[offsets[u]:offsets[u + 1]]
+    b = targets[offsets[v]:offsets[v + 1]]
+    common = _intersect_sorted(a, b)
+
+    if method == 'common_neighbours':
+        return len(common)
+    if method == 'jaccard':
+        union = len(a) + len(b) - len(common)
+        return len(common) / union if union else 0.0
+    #adamic_adar
+    score = 0.0
+    for w in common:
+        degree = offsets[w + 1] - offsets[w]
+        if degree > 1:
+            score += 1 / math.log(degree)
+    return score
+
+def _score_chunk(adjacency, method, id_pairs):
+    """
+    Score a list of dense id pairs; -1 marks a pair with a missing node, 
+    which scores the method's zero (0 for counts, 0.0 otherwise).
+    """
+    zero = 0 if method == 'common_neighbours' else 0.0
+    return [zero if u < 0 or v < 0 else _link_score(adjacency, method, u, v) for (u, v) in id_pairs]
+
+#Per-worker copy of the adjacency, set once by the pool initializer rather than pickled per chunk.
+_worker_adjacency = None
+
+def _init_score_worker(adjacency):
+    global _worker_adjacency
+    _worker_adjacency = adjacency
+
+def _score_chunk_in_worker(method, id_pairs):
+    return _score_chunk(_worker_adjacency, method, id_pairs)
+
+def score_pairs(*, network, pairs, method='jaccard', workers=None, chunk_size=100000):
+    """
+    Compute a link-prediction similarity score for many (u, v) node pairs.
+
+    Scores:
+        - 'common_neighbours': |N(u) & N(v)|
+        - 'jaccard': |N(u) & N(v)| / |N(u) | N(v)|
+        - 'adamic_adar': sum over shared neighbours w of 1 / log(degree(w))
+
+    Pairs are scored against sorted compact adjacency (a dict is converted 
+    once). With `workers` > 1, pairs are split into chunks of `chunk_size` 
+    and scored in a process pool; results always come back in pair order.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        pairs (iterable of tuples): (u, v) node pairs to score.
+        method (str): One of LINK_SCORES.
+        workers (int, optional): Number of worker processes.
+        chunk_size (int): Pairs per parallel chunk.
+
+    Returns:
+        list: One score per pair, 0 when either node is missing.
+
+    Raises:
+        ValueError: If `method` is not one of LINK_SCORES.
+    """
+    if method not in LINK_SCORES:
+        raise ValueError(f"method must be one of {LINK_SCORES}.")
+    adjacency = network if isinstance(network, CompactAdjacency) else to_compact_adjacency(network)
+
+    index = adjacency.index
+    id_pairs = [(index.get(u, -1), index.get(v, -1)) for (u, v) in pairs]
+
+    if not workers or workers <= 1 or len(id_pairs) <= chunk_size:
+        return _score_chunk(adjacency, method, id_pairs)
+
+    chunks = [id_pairs[i:i + chunk_size] for i in range(0, len(id_pairs), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_score_worker,
+                             initargs=(adjacency,)) as pool:
+        results = pool.map(_score_chunk_in_worker, [method] * len(chunks), chunks)
+        return [score for chunk in results for score in chunk]
+
+def top_k_similar(*, network, nodes, k=10, method='jaccard', exclude_neighbours=True):
+    """
+    Find the `k` highest-scoring nodes for each query node.
+    Only nodes two hops away can share a neighbour, so candidates are found 
+    by walking neighbours of neighbours, accumulating shared-neighbour 
+    counts (and Adamic-Adar weights) on the way, rather than scoring every 
+    node in the network.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        nodes (iterable of int): Query nodes.
+        k (int): Number of results per query node.
+        method (str): One of LINK_SCORES.
+        exclude_neighbours (bool): Leave out nodes already linked to the query node.
+
+    Returns:
+        dict: Maps each query node to a list of (node, score), best first.
+            Missing query nodes map to an empty list.
+
+    Raises:
+        ValueError: If `method` is not one of LINK_SCORES.
+    """
+    if method not in LINK_SCORES:
+        raise ValueError(f"method must be one of {LINK_SCORES}.")
+    adjacency = network if isinstance(network, CompactAdjacency) else to_compact_adjacency(network)
+    offsets, targets, external = adjacency.offsets, adjacency.targets, adjacency.nodes
+
+    results = {}
+    for node in nodes:
+        u = adjacency.index.get(node)
+        if u is None:
+            results[node] = []
+            continue
+
+        neighbours = targets[offsets[u]:offsets[u + 1]]
+        scores = {}
+        for w in neighbours:
+            weight = 1
+            if method == 'adamic_adar':
+                degree_w = offsets[w + 1] - offsets[w]
+                if degree_w <= 1:
+                    continue
+                weight = 1 / math.log(degree_w)
+            for v in targets[offsets[w]:offsets[w + 1]]:
+                scores[v] = scores.get(v, 0) + weight
+
+        scores.pop(u, None)
+        if exclude_neighbours:
+            for v in neighbours:
+                scores.pop(v, None)
+
+        if method == 'jaccard':
+            degree_u = len(neighbours)
+            for v, common in scores.items():
+                scores[v] = common / (degree_u + offsets[v + 1] - offsets[v] - common)
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        results[node] = [(external[v], score) for (v, score) in best]
+    return results
+
+#Out-of-core storage.
+#A disk adjacency file holds a graph too large for memory. Layout, all
+#native-endian signed 64-bit integers:
+#    header:     magic, N (nodes), M (neighbour entries)
+#    nodes:      N external node ids, ascending
+#    offsets:    N + 1 positions into neighbours
+#    neighbours: M external ids; node i's neighbours are
+#                neighbours[offsets[i]:offsets[i + 1]], ascending
+#It is built by an external merge sort and read through mmap, so only the
+#pages actually touched are loaded.
+DISK_MAGIC = 0x4E455441444A  #"NETADJ"
+_DISK_HEADER = struct.Struct('=qqq')
+
+def _write_run(pairs, tmp_dir):
+    """
+    Sort and deduplicate a run of (u, v) half-edges and write it to a temporary file.
+    """
+    pairs = sorted(set(pairs))
+    run = tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False, suffix='.run')
+    with run:
+        flat = array('q')
+        for (u, v) in pairs:
+            flat.append(u)
+            flat.append(v)
+        flat.tofile(run)
+    return run.name
+
+def _read_run(path, block_pairs=65536):
+    """
+    Yield the (u, v) pairs of a run file, reading it in blocks.
+    """
+    with open(path, 'rb') as f:
+        while True:
+            block = array('q')
+            try:
+                block.fromfile(f, 2 * block_pairs)
+            except EOFError:
+                pass #Short final block: fromfile keeps what it read.
+            if not block:
+                return
+            for i in range(0, len(block), 2):
+                yield (block[i], block[i + 1])
+
+def _merge_runs(runs, tmp_dir, block_pairs=65536):
+    """
+    Merge sorted run files into one new run file, dropping repeated pairs.
+    """
+    merged = tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False, suffix='.run')
+    with merged:
+        buffer = array('q')
+        previous = None
+        for pair in heapq.merge(*(_read_run(path) for path in runs)):
+            if pair == previous:
+                continue
+            buffer.append(pair[0])
+            buffer.append(pair[1])
+            previous = pair
+            if len(buffer) >= 2 * block_pairs:
+                buffer.tofile(merged)
+                del buffer[:]
+        buffer.tofile(merged)
+    return merged.name
+
+def _reduce_runs(runs, fan_in, tmp_dir):
+    """
+    Merge groups of at most `fan_in` runs into intermediate runs, in as 
+    many passes as needed, until at most `fan_in` remain. `runs` is updated 
+    in place, so it always lists the run files that exist.
+    """
+    while len(runs) > fan_in:
+        group = runs[:fan_in]
+        merged = _merge_runs(group, tmp_dir)
+        runs.append(merged)
+        for path in group:
+            os.remove(path)
+        del runs[:fan_in]
+
+def build_disk_adjacency(fName, out_path, run_edges=1000000, tmp_dir=None, fan_in=64):
+    """
+    Convert a TSV edge file into a disk adjacency file without loading it.
+    Both directions of every edge are collected in sorted runs of at most 
+    2 * `run_edges` entries, spilled to temporary files, then k-way merged 
+    with repeated edges dropped (as in edge_to_neighbour_list_1), so memory 
+    use is bounded by the run size rather than the graph size. At most 
+    `fan_in` runs are open at once: with more runs, they are first merged 
+    into intermediate runs in several passes.
+
+    Args:
+        fName (str): Path to the TSV file.
+        out_path (str): Path of the adjacency file to write.
+        run_edges (int): Edges per in-memory sorted run.
+        tmp_dir (str, optional): Directory for the temporary run files.
+        fan_in (int): Maximum number of run files merged (and open) at once.
+
+    Returns:
+        tuple: (number of nodes, number of neighbour entries) written.
+
+    Raises:
+        ValueError: If `fan_in` is less than 2.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2.")
+
+    runs = []
+    section_paths = []
+    try:
+        pairs = []
+        for (a, b) in _iter_edges(fName):
+            pairs.append((a, b))
+            pairs.append((b, a))
+            if len(pairs) >= 2 * run_edges:
+                runs.append(_write_run(pairs, tmp_dir))
+                pairs = []
+        if pairs or not runs:
+            runs.append(_write_run(pairs, tmp_dir))
+        del pairs
+        _reduce_runs(runs, fan_in, tmp_dir)
+
+        #Stream the merged half-edges into the three sections, buffering writes.
+        section_paths = [tempfile.NamedTemporaryFile(dir=tmp_dir, delete=False).name for _ in range(3)]
+        section_files = [open(path, 'wb') for path in section_paths]
+        buffers = [array('q'), array('q', [0]), array('q')]
+        n_nodes = n_entries = 0
+        try:
+            previous = None
+            for pair in heapq.merge(*(_read_run(path) for path in runs)):
+                if pair == previous:
+                    continue
+                u, v = pair
+                if previous is None or u != previous[0]:
+                    if previous is not None:
+                        buffers[1].append(n_entries)
+                    buffers[0].append(u)
+                    n_nodes += 1
+                buffers[2].append(v)
+                n_entries += 1
+                previous = pair
+                if len(buffers[2]) >= 65536:
+                    for buffer, section in zip(buffers, section_files):
+                        buffer.tofile(section)
+                        del buffer[:]
+            if previous is not None:
+                buffers[1].append(n_entries)
+            for buffer, section in zip(buffers, section_files):
+                buffer.tofile(section)
+        finally:
+            for section in section_files:
+                section.close()
+
+        with open(out_path, 'wb') as out:
+            out.write(_DISK_HEADER.pack(DISK_MAGIC, n_nodes, n_entries))
+            for path in section_paths:
+                with open(path, 'rb') as section:
+                    shutil.copyfileobj(section, out)
+    finally:
+        for path in runs + section_paths:
+            os.remove(path)
+
+    return (n_nodes, n_entries)
+
+class DiskAdjacency:
+    """
+    Read-only, memory-mapped view of a file written by build_disk_adjacency.
+    Nodes are located by binary search over the sorted node ids, so no 
+    in-memory index is needed. Can be passed to inspect_node, 
+    get_degree_statistics and get_clustering_coefficient, and used as a 
+    context manager to close the mapping.
+    """
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Path to the adjacency file.
+
+        Raises:
+            ValueError: If the file is not a disk adjacency file.
+        """
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size < _DISK_HEADER.size:
+            self._file.close()
+            raise ValueError(f"{path} is not a disk adjacency file.")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_nodes, n_entries = _DISK_HEADER.unpack_from(self._mmap, 0)
+        if magic != DISK_MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a disk adjacency file.")
+
+        view = memoryview(self._mmap)
+        start = _DISK_HEADER.size
+        sections = []
+        for length in (n_nodes, n_nodes + 1, n_entries):
+            sections.append(view[start:start + 8 * length].cast('q'))
+            start += 8 * length
+        self.nodes, self.offsets, self.targets = sections
+        view.release()
+
+    def close(self):
+        """
+        Release the memory mapping and the file.
+        """
+        try:
+            for name in ('nodes', 'offsets', 'targets'):
+                section = getattr(self, name, None)
+                if section is not None:
+                    section.release()
+            self._mmap.close()
+        finally:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def _position(self, node):
+        i = bisect_left(self.nodes, node)
+        return i if i < len(self.nodes) and self.nodes[i] == node else None
+
+    def __contains__(self, node):
+        return self._position(node) is not None
+
+    def _neighbour_view(self, node):
+        """
+        Return the sorted neighbour ids of `node` as a view into the mapping 
+        (empty if absent). The view must be dropped before close().
+        """
+        i = self._position(node)
+        if i is None:
+            return self.targets[0:0]
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def neighbours(self, node):
+        """
+        Return the sorted neighbour ids of `node` as an array owned by the 
+        caller (empty if absent), so it stays valid after close().
+        """
+        return array('q', self._neighbour_view(node))
+
+    def degree_statistics(self):
+        """
+        Compute get_degree_statistics in one sequential pass over the offsets.
+        """
+        if not len(self.nodes):
+            return (0, 0, 0.0, 0)
+        offsets = self.offsets
+        count = Counter(offsets[i + 1] - offsets[i] for i in range(len(self.nodes)))
+        return _summarise_degree_counts(count)
+
+    def clustering_coefficient(self, node):
+        """
+        Compute get_clustering_coefficient for `node`. Neighbours are visited 
+        in ascending id order, which is also their order in the file, and 
+        edges among them are counted by merging sorted neighbour runs.
+        """
+        neighbours = self._neighbour_view(node)
+        k = len(neighbours)
+        if k < 2:
+            return 0.0
+
+        twice_E_N = 0
+        for v in neighbours:
+            common = _intersect_sorted(self._neighbour_view(v), neighbours)
+            #A self-loop on v is not an edge between two distinct neighbours.
+            twice_E_N += len(common) - (v in common)
+        return twice_E_N / (k * (k - 1))
+
+#Global centrality.
+#PageRank and eigenvector centrality run power iteration over compact (CSR)
+#adjacency. With NumPy installed each iteration is a handful of array
+#operations; without it the same iteration runs over the integer arrays.
+def _power_iteration(adjacency, step, x, tol, max_iter):
+    """
+    Repeat x = step(x) until the L1 change is below N * tol.
+
+    Raises:
+        RuntimeError: If it has not converged after max_iter iterations.
+    """
+    n = len(adjacency.nodes)
+    for _ in range(max_iter):
+        x_new = step(x)
+        if np is not None:
+            change = float(np.abs(x_new - x).sum())
+        else:
+            change = sum(abs(a - b) for a, b in zip(x_new, x))
+        x = x_new
+        if change < n * tol:
+            return x
+    raise RuntimeError(f"Power iteration did not converge in {max_iter} iterations.")
+
+def _start_vector(adjacency, initial):
+    """
+    Starting vector for power iteration: uniform, or a previous result 
+    (a dict of node scores, missing nodes getting the mean) for a warm start. 
+    A warm start with no positive score would stay at zero, so it falls 
+    back to uniform. Normalised to sum to 1.
+    """
+    n = len(adjacency.nodes)
+    x = None
+    if initial:
+        mean = sum(initial.values()) / len(initial)
+        x = [max(initial.get(node, mean), 0.0) for node in adjacency.nodes]
+    if not x or sum(x) <= 0:
+        x = [1.0] * n
+    total = sum(x)
+    x = [value / total for value in x]
+    return np.array(x) if np is not None else x
+
+def _csr_for(network):
+    adjacency = network if isinstance(network, CompactAdjacency) else to_compact_adjacency(network)
+    offsets = adjacency.offsets
+    degrees = [offsets[i + 1] - offsets[i] for i in range(len(adjacency.nodes))]
+    return adjacency, degrees
+
+def pagerank(network, damping=0.85, tol=1e-10, max_iter=200, initial=None):
+    """
+    Compute the PageRank of every node.
+    Each node keeps (1 - damping) / N of the rank and receives `damping` 
+    times its neighbours' rank, each neighbour's rank split evenly over its 
+    edges. Dangling nodes (no neighbours) spread their rank over all nodes.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        damping (float): Probability of following an edge rather than jumping.
+        tol (float): Convergence tolerance per node.
+        max_iter (int): Maximum number of iterations.
+        initial (dict, optional): A previous result to warm start from.
+
+    Returns:
+        dict: Maps each node to its PageRank; the values sum to 1.
+
+    Raises:
+        RuntimeError: If the iteration does not converge within max_iter.
+    """
+    adjacency, degrees = _csr_for(network)
+    n = len(adjacency.nodes)
+    if n == 0:
+        return {}
+
+    if np is not None:
+        targets = np.frombuffer(adjacency.targets, dtype=np.int64)
+        degree_array = np.array(degrees, dtype=np.float64)
+        sources = np.repeat(np.arange(n), degrees)
+        dangling = degree_array == 0
+        inverse_degree = np.divide(1.0, degree_array, out=np.zeros(n), where=~dangling)
+
+        def step(x):
+            share = (x * inverse_degree)[sources]
+            spread = np.bincount(targets, weights=share, minlength=n)
+            return (1 - damping) / n + damping * (spread + x[dangling].sum() / n)
+    else:
+        offsets, targets = adjacency.offsets, adjacency.targets
+
+        def step(x):
+            dangling_mass = sum(x[u] for u in range(n) if degrees[u] == 0)
+            base = (1 - damping) / n + damping * dangling_mass / n
+            x_new = [base] * n
+            for u in range(n):
+                if degrees[u]:
+                    share = damping * x[u] / degrees[u]
+                    for v in targets[offsets[u]:offsets[u + 1]]:
+                        x_new[v] += share
+            return x_new
+
+    x = _power_iteration(adjacency, step, _start_vector(adjacency, initial), tol, max_iter)
+    return {node: float(x[i]) for i, node in enumerate(adjacency.nodes)}
+
+def eigenvector_centrality(network, tol=1e-10, max_iter=500, initial=None):
+    """
+    Compute the eigenvector centrality of every node: the principal 
+    eigenvector of the adjacency matrix, so a node is important when its 
+    neighbours are. Iterates x = x + A x (the shift keeps power iteration 
+    from oscillating on bipartite graphs) and normalises each step.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        tol (float): Convergence tolerance per node.
+        max_iter (int): Maximum number of iterations.
+        initial (dict, optional): A previous result to warm start from.
+
+    Returns:
+        dict: Maps each node to its centrality, scaled to unit Euclidean length.
+
+    Raises:
+        RuntimeError: If the iteration does not converge within max_iter.
+    """
+    adjacency, degrees = _csr_for(network)
+    n = len(adjacency.nodes)
+    if n == 0:
+        return {}
+
+    if np is not None:
+        targets = np.frombuffer(adjacency.targets, dtype=np.int64)
+        sources = np.repeat(np.arange(n), degrees)
+
+        def step(x):
+            x_new = x + np.bincount(targets, weights=x[sources], minlength=n)
+            return x_new / (np.linalg.norm(x_new) or 1.0)
+    else:
+        offsets, targets = adjacency.offsets, adjacency.targets
+
+        def step(x):
+            x_new = list(x)
+            for u in range(n):
+                xu = x[u]
+                if xu:
+                    for v in targets[offsets[u]:offsets[u + 1]]:
+                        x_new[v] += xu
+            norm = math.sqrt(sum(value * value for value in x_new)) or 1.0
+            return [value / norm for value in x_new]
+
+    x = _power_iteration(adjacency, step, _start_vector(adjacency, initial), tol, max_iter)
+    return {node: float(x[i]) for i, node in enumerate(adjacency.nodes)}
+
+#Community detection.
+def _renumber(labels):
+    """
+    Renumber community labels to 0..C-1 in order of first appearance.
+    """
+    mapping = {}
+    return [mapping.setdefault(label, len(mapping)) for label in labels]
+
+def _compact_modularity(offsets, targets, weights, labels):
+    """
+    Modularity of a labelling of weighted CSR adjacency. `weights` may be 
+    None for an unweighted graph.
+    """
+    n = len(offsets) - 1
+    internal = 0.0
+    totals = {}
+    two_m = 0.0
+    for u in range(n):
+        degree = 0.0
+        for e in range(offsets[u], offsets[u + 1]):
+            w = weights[e] if weights is not None else 1
+            degree += w
+            if labels[targets[e]] == labels[u]:
+                internal += w
+        totals[labels[u]] = totals.get(labels[u], 0.0) + degree
+        two_m += degree
+    if two_m == 0:
+        return 0.0
+    return internal / two_m - sum((total / two_m) ** 2 for total in totals.values())
+
+def modularity(network, labels):
+    """
+    Compute the modularity of a partition of the network into communities:
+    the fraction of edges inside communities minus the fraction expected 
+    if edges were placed at random with the same degrees.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        labels (dict): Maps each node to its community label.
+
+    Returns:
+        float: The modularity, between -0.5 and 1.0 (0.0 for a network with no edges).
+    """
+    adjacency = network if isinstance(network, CompactAdjacency) else to_compact_adjacency(network)
+    compact_labels = [labels[node] for node in adjacency.nodes]
+    return _compact_modularity(adjacency.offsets, adjacency.targets, None, compact_labels)
+
+def label_propagation(network, seed=None, max_iter=100):
+    """
+    Detect communities by asynchronous label propagation.
+    Every node starts in its own community. On each sweep nodes are visited 
+    in a random (seeded) order and adopt the label most common among their 
+    neighbours, ties broken at random. Stops early once a sweep changes no 
+    labels.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        seed (int, optional): Seed for the visiting order and tie breaks.
+        max_iter (int): Maximum number of sweeps.
+
+    Returns:
+        tuple: (labels, modularity), where `labels` maps each node to a 
+            community number 0..C-1.
+    """
+    adjacency = network if isinstance(network, CompactAdjacency) else to_compact_adjacency(network)
+    offsets, targets = adjacency.offsets, adjacency.targets
+    n = len(adjacency.nodes)
+    rng = random.Random(seed)
+    labels = list(range(n))
+    order = list(range(n))
+
+    for _ in range(max_iter):
+        rng.shuffle(order)
+        changed = False
+        for u in order:
+            if offsets[u] == offsets[u + 1]:
+                continue
+            counts = Counter(labels[v] for v in targets[offsets[u]:offsets[u + 1]])
+            best_count = max(counts.values())
+            if counts.get(labels[u]) == best_count:
+                continue #Keeping the current label avoids needless flips.
+            best = [label for label, count in counts.items() if count == best_count]
+            labels[u] = best[rng.randrange(len(best))]
+            changed = True
+        if not changed:
+            break
+
+    labels = _renumber(labels)
+    score = _compact_modularity(offsets, targets, None, labels)
+    return ({node: labels[i] for i, node in enumerate(adjacency.nodes)}, score)
+
+def _louvain_local_moves(offsets, targets, weights, rng, max_sweeps, tol):
+    """
+    Louvain phase one on weighted CSR adjacency: move single nodes to the 
+    neighbouring community with the largest modularity gain until a sweep 
+    improves modularity by less than `tol`. Community degree totals are 
+    updated incrementally, so each move costs O(degree).
+
+    Returns:
+        tuple: (community of each node, whether any node moved).
+    """
+    n = len(offsets) - 1
+    degree = [sum(weights[offsets[u]:offsets[u + 1]]) for u in range(n)]
+    two_m = sum(degree)
+    community = list(range(n))
+    totals = list(degree)
+    moved_any = False
+    order = list(range(n))
+
+    for _ in range(max_sweeps):
+        rng.shuffle(order)
+        improvement = 0.0
+        for u in order:
+            current = community[u]
+            #Weight from u into each neighbouring community.
+            links = {}
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if v != u:
+                    links[community[v]] = links.get(community[v], 0.0) + weights[e]
+
+            #Take u out of its community, then put it where the gain is largest.
+            totals[current] -= degree[u]
+            best = current
+            best_gain = links.get(current, 0.0) - totals[current] * degree[u] / two_m
+            for candidate, weight in links.items():
+                gain = weight - totals[candidate] * degree[u] / two_m
+                if gain > best_gain:
+                    best, best_gain = candidate, gain
+            totals[best] += degree[u]
+
+            if best != current:
+                stay_gain = links.get(current, 0.0) - totals[current] * degree[u] / two_m
+                improvement += (best_gain - stay_gain) / two_m
+                community[u] = best
+                moved_any = True
+        if improvement < tol:
+            break
+
+    return community, moved_any
+
+def _aggregate(offsets, targets, weights, community):
+    """
+    Louvain phase two: build the weighted CSR graph whose nodes are the 
+    communities, with edge weights summed (internal weight becomes a self-loop).
+    """
+    n_communities = max(community) + 1
+    rows = [dict() for _ in range(n_communities)]
+    for u in range(len(offsets) - 1):
+        row = rows[community[u]]
+        for e in range(offsets[u], offsets[u + 1]):
+            c = community[targets[e]]
+            row[c] = row.get(c, 0.0) + weights[e]
+
+    new_offsets = array('q', [0])
+    new_targets = array('q')
+    new_weights = array('d')
+    for row in rows:
+        for c in sorted(row):
+            new_targets.append(c)
+            new_weights.append(row[c])
+        new_offsets.append(len(new_targets))
+    return new_offsets, new_targets, new_weights
+
+def louvain(network, seed=None, max_levels=20, max_sweeps=50, tol=1e-7):
+    """
+    Detect communities with the Louvain method of modularity optimisation.
+    Alternates local moving of nodes between communities (in a random, 
+    seeded order, with incremental modularity-gain bookkeeping) and 
+    aggregation of each community into a single node, stopping early when a 
+    level no longer moves any node.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+        seed (int, optional): Seed for the visiting order.
+        max_levels (int): Maximum number of aggregation levels.
+        max_sweeps (int): Maximum local-moving sweeps per level.
+        tol (float): Minimum modularity improvement for a sweep to continue.
+
+    Returns:
+        tuple: (labels, modularity), where `labels` maps each node to a 
+            community number 0..C-1.
+    """
+    adjacency = network if isinstance(network, CompactAdjacency) else to_compact_adjacency(network)
+    n = len(adjacency.nodes)
+    rng = random.Random(seed)
+    offsets, targets = adjacency.offsets, adjacency.targets
+    weights = array('d', [1.0]) * len(targets)
+
+    #membership[i] is the current-level node that original node i belongs to.
+    membership = list(range(n))
+    if len(targets):
+        for _ in range(max_levels):
+            community, moved = _louvain_local_moves(offsets, targets, weights, rng, max_sweeps, tol)
+            if not moved:
+                break
+            community = _renumber(community)
+            membership = [community[m] for m in membership]
+            offsets, targets, weights = _aggregate(offsets, targets, weights, community)
+
+    labels = _renumber(membership)
+    score = _compact_modularity(adjacency.offsets, adjacency.targets, None, labels)
+    return ({node: labels[i] for i, node in enumerate(adjacency.nodes)}, score)
+
+#K-cores.
+def core_decomposition(network):
+    """
+    Compute the core number of every node and a degeneracy ordering, in 
+    O(V + E) with the bucket algorithm of Batagelj and Zaversnik.
+    A node's core number is the largest k such that it belongs to a 
+    subgraph in which every node has at least k neighbours. Nodes are 
+    repeatedly removed in order of current degree (kept in degree buckets); 
+    that removal order is a degeneracy ordering, in which every node has at 
+    most `degeneracy` neighbours later in the order. Self-loops are ignored.
+
+    Args:
+        network (dict or CompactAdjacency): The network representation.
+
+    Returns:
+        tuple: (core_numbers, ordering), where `core_numbers` maps each node 
+            to its core number and `ordering` lists the nodes in degeneracy order.
+    """
+    adjacency = network if isinstance(network, CompactAdjacency) else to_compact_adjacency(network)
+    offsets, targets = adjacency.offsets, adjacency.targets
+    n = len(adjacency.nodes)
+
+    degree = array('q', [0]) * n
+    for u in range(n):
+        degree[u] = sum(1 for v in targets[offsets[u]:offsets[u + 1]] if v != u)
+    max_degree = max(degree, default=0)
+
+    #Bucket sort nodes by degree: order holds nodes sorted by degree,
+    #position[u] is u's index in order, and start[d] is where degree d begins.
+    start = array('q', [0]) * (max_degree + 1)
+    for d in degree:
+        start[d] += 1
+    total = 0
+    for d in range(max_degree + 1):
+        start[d], total = total, total + start[d]
+    order = array('q', [0]) * n
+    position = array('q', [0]) * n
+    fill = array('q', start)
+    for u in range(n):
+        position[u] = fill[degree[u]]
+        order[position[u]] = u
+        fill[degree[u]] += 1
+
+    for i in range(n):
+        u = order[i]
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if degree[v] > degree[u]:
+                #Move v to the front of its bucket, then shrink its degree by one.
+                d = degree[v]
+                w = order[start[d]]
+                if w != v:
+                    order[position[v]], order[start[d]] = w, v
+                    position[w], position[v] = position[v], start[d]
+                start[d] += 1
+                degree[v] -= 1
+
+    nodes = adjacency.nodes
+    core_numbers = {nodes[u]: degree[u] for u in range(n)}
+    return core_numbers, [nodes[u] for u in order]
+
+def k_core(network, k, core_numbers=None):
+    """
+    Return the k-core: the neighbour list restricted to nodes with core number at least k.
+
+    Args:
+        network (dict): A dictionary mapping each node to a set of its neighbors.
+        k (int): Minimum core number to keep.
+        core_numbers (dict, optional): Precomputed result of core_decomposition.
+
+    Returns:
+        dict: The pruned neighbour dictionary.
+    """
+    if core_numbers is None:
+        core_numbers = core_decomposition(network)[0]
+    keep = {node for node, core in core_numbers.items() if core >= k}
+    return {node: network[node] & keep for node in network if node in keep}
+
+def count_triangles(network, ordering=None):
+    """
+    Count the triangles each node belongs to.
+    Every edge is directed from the endpoint earlier in `ordering` to the 
+    later one. With a degeneracy ordering, each node then has at most 
+    `degeneracy` out-neighbours, and each triangle is found exactly once by 
+    intersecting the out-neighbour sets of its edges, giving 
+    O(E * degeneracy) work instead of O(sum of k^2).
+
+    Args:
+        network (dict): A dictionary mapping each node to a set of its neighbors.
+        ordering (list, optional): Node order to orient edges by; defaults to 
+            the degeneracy ordering from core_decomposition.
+
+    Returns:
+        dict: Maps each node to its number of triangles.
+    """
+    if ordering is None:
+        ordering = core_decomposition(network)[1]
+    rank = {node: i for i, node in enumerate(ordering)}
+
+    later = {node: {v for v in network[node] if rank[v] > rank[node]} for node in network}
+    triangles = dict.fromkeys(network, 0)
+    for u in network:
+        later_u = later[u]
+        for v in later_u:
+            for w in later_u & later[v]:
+                triangles[u] += 1
+                triangles[v] += 1
+                triangles[w] += 1
+    return triangles
+
+def get_all_clustering_coefficients(network, ordering=None):
+    """
+    Compute get_clustering_coefficient for every node at once, using 
+    count_triangles so that the work is bounded by the degeneracy rather 
+    than by the squared degree of the hubs.
+
+    Args:
+        network (dict): A dictionary mapping each node to a set of its neighbors.
+        ordering (list, optional): Passed on to count_triangles.
+
+    Returns:
+        dict: Maps each node to its clustering coefficient.
+    """
+    triangles = count_triangles(network, ordering)
+    coefficients = {}
+    for node, neighbours in network.items():
+        k = len(neighbours)
+        if k < 2:
+            coefficients[node] = 0.0
+            continue
+        E_N = triangles[node]
+        if node in neighbours:
+            #get_clustering_coefficient treats a self-loop node as linked to every other neighbour.
+            E_N += k - 1
+        coefficients[node] = 2 * E_N / (k * (k - 1))
+    return coefficients
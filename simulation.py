@@ -0,0 +1,209 @@
+#File: simulation.py
+#Author: Taylor King
+#Description: Monte Carlo simulation of tournaments. Runs many independent tournaments from one config
+#  across a process pool, each with its own seeded random number generator, and aggregates the champion
+#  frequencies, champion score distribution and per-sponsor win rates. Results are streamed as runs
+#  complete, so long simulations can report progress and partial summaries.
+#
+#  Usage:
+#    python simulation.py --runs 1000                   #Simulate 1000 greedy tournaments.
+#    python simulation.py --runs 1000 --optimised       #Use the dynamic programming purchases.
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tournament import Tournament, Tournament_optimised
+
+#Runs sent to a worker process per task, so small tournaments are not dominated by pickling overhead.
+DEFAULT_CHUNK_SIZE = 16
+
+def run_seeds(n_runs, base_seed=0):
+    """
+    Derive one independent seed per run from a base seed, so a simulation is reproducible
+    regardless of how its runs are distributed across processes.
+
+    :param n_runs: Number of runs.
+    :param base_seed: Seed for the whole simulation.
+    :return: List of integer seeds.
+    """
+    rng = random.Random(base_seed)
+    return [rng.getrandbits(64) for _ in range(n_runs)]
+
+def run_tournament(config_path, seed, optimised=False, fixed_budget=None):
+    """
+    Run one complete tournament (sponsors, teams, purchases and event) with its own seeded RNG.
+    The tournament's printed output is discarded.
+
+    :param config_path: Path to the tournament config file.
+    :param seed: Seed for this run's random number generator.
+    :param optimised: Use Tournament_optimised (knapsack purchases) instead of the greedy Tournament.
+    :param fixed_budget: Optional fixed budget for every team.
+    :return: Dict with 'seed', 'champion', 'champion_score' and 'teams', a list of
+        (sponsor, initial_budget, wins, losses, final_score) tuples in bracket order.
+    """
+    cls = Tournament_optimised if optimised else Tournament
+    with contextlib.redirect_stdout(io.StringIO()):
+        tournament = cls(config_path, seed=seed)
+        tournament.generate_sponsors(fixed_budget=fixed_budget)
+        tournament.generate_teams()
+        tournament.buy_cars()
+        tournament.hold_event()
+
+    teams = [(team.sponsor, budget, team.performance['wins'], team.performance['losses'],
+              tournament._team_total_mpg(team))
+             for team, budget in zip(tournament.teams, tournament.budgets)]
+    return {
+        'seed': seed,
+        'champion': tournament.champion.sponsor,
+        'champion_score': tournament._team_total_mpg(tournament.champion),
+        'teams': teams,
+    }
+
+def _run_chunk(config_path, seeds, optimised, fixed_budget):
+    """
+    Worker task: run the tournaments for a chunk of seeds.
+    """
+    return [run_tournament(config_path, seed, optimised, fixed_budget) for seed in seeds]
+
+def iter_simulations(config_path='./data/config.json', n_runs=100, base_seed=0, optimised=False,
+                     fixed_budget=None, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Run n_runs tournaments and yield each run's result as soon as it is available.
+    With max_workers=1 the runs execute in this process, in seed order; otherwise chunks
+    of runs are spread across a process pool and yielded in completion order.
+
+    :param config_path: Path to the tournament config file.
+    :param n_runs: Number of tournaments to run.
+    :param base_seed: Seed from which every run's seed is derived.
+    :param optimised: Use Tournament_optimised instead of Tournament.
+    :param fixed_budget: Optional fixed budget for every team.
+    :param max_workers: Number of worker processes (default os.cpu_count()).
+    :param chunk_size: Runs per worker task.
+    :return: Generator of run result dicts, as returned by run_tournament.
+    """
+    assert n_runs >= 0, "n_runs must be non-negative."
+    assert chunk_size > 0, "chunk_size must be positive."
+    seeds = run_seeds(n_runs, base_seed)
+
+    if max_workers == 1:
+        for seed in seeds:
+            yield run_tournament(config_path, seed, optimised, fixed_budget)
+        return
+
+    chunks = [seeds[i:i + chunk_size] for i in range(0, n_runs, chunk_size)]
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = [executor.submit(_run_chunk, config_path, chunk, optimised, fixed_budget) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+
+class SimulationSummary:
+    """
+    Running aggregate of tournament results: champion frequencies, the champion score
+    distribution, and per-sponsor entries, titles and match records.
+    Results can be added in any order; the summary only depends on which runs were added.
+    """
+    def __init__(self):
+        self.runs = 0
+        self.champion_counts = Counter()
+        self.champion_scores = []
+        self.entries = Counter()
+        self.match_wins = Counter()
+        self.match_losses = Counter()
+
+    def add(self, result):
+        """
+        Adds one run result from run_tournament.
+        """
+        self.runs += 1
+        self.champion_counts[result['champion']] += 1
+        self.champion_scores.append(result['champion_score'])
+        for sponsor, _, wins, losses, _ in result['teams']:
+            self.entries[sponsor] += 1
+            self.match_wins[sponsor] += wins
+            self.match_losses[sponsor] += losses
+
+    def champion_frequency(self):
+        """
+        Returns a dict mapping sponsor to the fraction of runs it won, most frequent first.
+        """
+        return {sponsor: count / self.runs for sponsor, count in self.champion_counts.most_common()}
+
+    def win_rates(self):
+        """
+        Returns a dict mapping sponsor to {'entries', 'titles', 'title_rate', 'match_win_rate'}.
+        title_rate is titles per entry; match_win_rate is matches won per match played.
+        """
+        rates = {}
+        for sponsor in sorted(self.entries):
+            played = self.match_wins[sponsor] + self.match_losses[sponsor]
+            rates[sponsor] = {
+                'entries': self.entries[sponsor],
+                'titles': self.champion_counts[sponsor],
+                'title_rate': self.champion_counts[sponsor] / self.entries[sponsor],
+                'match_win_rate': self.match_wins[sponsor] / played if played else 0.0,
+            }
+        return rates
+
+    def score_distribution(self):
+        """
+        Returns summary statistics of the champion scores (empty if no runs were added).
+        """
+        scores = sorted(self.champion_scores)
+        if not scores:
+            return {}
+        return {
+            'min': scores[0],
+            'max': scores[-1],
+            'mean': statistics.fmean(scores),
+            'median': statistics.median(scores),
+            'stdev': statistics.pstdev(scores),
+        }
+
+    def __str__(self):
+        lines = [f"Runs: {self.runs}", f"Champion score: {self.score_distribution()}", "Champions:"]
+        for sponsor, frequency in self.champion_frequency().items():
+            lines.append(f"  {sponsor}: {frequency:.1%}")
+        return "\n".join(lines)
+
+def simulate(config_path='./data/config.json', n_runs=100, base_seed=0, optimised=False, fixed_budget=None,
+             max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Run a Monte Carlo simulation of n_runs tournaments and aggregate the results.
+
+    :param progress: Optional callback called as progress(summary, result) after each run completes,
+        for streaming partial results.
+    :return: SimulationSummary of all runs.
+    """
+    summary = SimulationSummary()
+    for result in iter_simulations(config_path, n_runs, base_seed, optimised, fixed_budget, max_workers, chunk_size):
+        summary.add(result)
+        if progress is not None:
+            progress(summary, result)
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo simulation of tournaments.")
+    parser.add_argument('--config', default='./data/config.json', help="Tournament config path.")
+    parser.add_argument('--runs', type=int, default=100, help="Number of tournaments to simulate.")
+    parser.add_argument('--seed', type=int, default=0, help="Base seed for the simulation.")
+    parser.add_argument('--optimised', action='store_true', help="Use knapsack (DP) purchases.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default CPU count).")
+    parser.add_argument('--report-every', type=int, default=0, help="Print a partial summary every N runs.")
+    args = parser.parse_args(argv)
+
+    def report(summary, _):
+        if args.report_every and summary.runs % args.report_every == 0 and summary.runs < args.runs:
+            print(f"{summary}\n")
+
+    summary = simulate(args.config, args.runs, args.seed, args.optimised, max_workers=args.workers, progress=report)
+    print(summary)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+#File: test_benchmark_network.py
+#Author: Taylor King
+
+import tracemalloc
+import unittest
+
+from network import edge_to_neighbour_list_1, get_degree_statistics
+from benchmark_network import (
+    erdos_renyi_edges,
+    barabasi_albert_edges,
+    configuration_model_edges,
+    measure,
+    run_workload,
+    compare_to_baselines
+)
+
+class TestGenerators(unittest.TestCase):
+    """
+    Tests for the seeded synthetic graph generators.
+    """
+    def test_seeded_and_sized(self):
+        """
+        Each generator is reproducible for a fixed seed and produces about the requested number of edges.
+        """
+        for generator in (erdos_renyi_edges, barabasi_albert_edges, configuration_model_edges):
+            edges = generator(1000, seed=7)
+            self.assertEqual(edges, generator(1000, seed=7), f"{generator.__name__} is not reproducible")
+            self.assertGreater(len(edges), 900, f"{generator.__name__} produced too few edges")
+            self.assertLessEqual(len(edges), 1000, f"{generator.__name__} produced too many edges")
+            self.assertTrue(all(a != b for (a, b) in edges), f"{generator.__name__} produced a self-loop")
+
+    def test_skewed_degrees(self):
+        """
+        Preferential attachment and the power-law model should have much larger hubs than Erdos-Renyi.
+        """
+        er_max = get_degree_statistics(edge_to_neighbour_list_1(erdos_renyi_edges(10000, seed=1)))[0]
+        ba_max = get_degree_statistics(edge_to_neighbour_list_1(barabasi_albert_edges(10000, seed=1)))[0]
+        cm_max = get_degree_statistics(edge_to_neighbour_list_1(configuration_model_edges(10000, seed=1)))[0]
+        self.assertGreater(ba_max, 3 * er_max, "Barabasi-Albert graph should have hubs")
+        self.assertGreater(cm_max, 3 * er_max, "Configuration model graph should have hubs")
+
+class TestRunWorkload(unittest.TestCase):
+    """
+    Tests for the timing harness and baseline comparison.
+    """
+    def test_measure_times_untraced_run(self):
+        """
+        The timed run is separate from the traced run, so tracemalloc is off while timing.
+        """
+        tracing = []
+
+        def workload():
+            tracing.append(tracemalloc.is_tracing())
+            return [0] * 100000
+
+        result, seconds, peak = measure(workload)
+        self.assertEqual(tracing, [False], "Without memory=True there should be a single untraced run")
+        self.assertIsNone(peak)
+
+        del tracing[:]
+        result, seconds, peak = measure(workload, memory=True)
+        self.assertEqual(tracing, [False, True], "Timing should be untraced, then one traced run for memory")
+        self.assertEqual(len(result), 100000)
+        self.assertGreaterEqual(seconds, 0)
+        self.assertGreaterEqual(peak, 100000 * 8, "Peak memory should include the workload's list")
+
+    def test_run_and_compare(self):
+        """
+        A small run times every workload, and a doubled time is flagged against a baseline.
+        """
+        results = {'erdos_renyi': {'1000': run_workload('erdos_renyi', 1000, seed=0)}}
+        workloads = results['erdos_renyi']['1000']
+        self.assertEqual(set(workloads), {'file_to_edge_list', 'edge_to_neighbour_list_1', 'edge_to_neighbour_list_2',
+                                          'get_degree_statistics', 'get_clustering_coefficient'})
+
+        baselines = {'erdos_renyi': {'1000': {'file_to_edge_list': {
+            'seconds': workloads['file_to_edge_list']['seconds'] / 2, 'peak_bytes': 0}}}}
+        rows = compare_to_baselines(results, baselines, tolerance=0.2)
+        self.assertEqual(len(rows), 1, "Only workloads with a baseline should be compared")
+        self.assertTrue(rows[0][-1], "A 2x slowdown should be flagged as a regression")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,56 @@
 #File: test_network.py
 #Author: Taylor King
 
+import math
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, mock_open
 
+import network
 from network import (
     file_to_edge_list,
     edge_to_neighbour_list_1,
     edge_to_neighbour_list_2,
     inspect_node,
+    inspect_nodes,
+    IndexedEdgeList,
     get_degree_statistics,
-    get_clustering_coefficient
+    get_degree_statistics_from_file,
+    get_clustering_coefficient,
+    estimate_clustering_coefficient,
+    estimate_transitivity,
+    estimate_average_clustering,
+    to_compact_adjacency,
+    file_to_compact_adjacency,
+    relabel_compact_adjacency,
+    bfs_distances,
+    shortest_path_length,
+    connected_components,
+    connected_components_from_file,
+    approximate_diameter,
+    BitsetAdjacency,
+    edge_to_adjacency,
+    MemoisedNetwork,
+    score_pairs,
+    top_k_similar,
+    build_disk_adjacency,
+    DiskAdjacency,
+    file_to_edge_arrays,
+    file_to_edge_list_parallel,
+    file_to_neighbour_list_parallel,
+    pagerank,
+    eigenvector_centrality,
+    modularity,
+    label_propagation,
+    louvain,
+    core_decomposition,
+    k_core,
+    count_triangles,
+    get_all_clustering_coefficients,
+    normalise_edges,
+    normalise_edge_list,
+    file_to_normalised_edges
 )
 
 class TestFileToEdgeList(unittest.TestCase):
@@ -153,6 +193,48 @@ class TestInspectNode(unittest.TestCase):
         self.assertEqual(result, set(),
                          "Missing node in a neighbor list should return an empty set")
 
+class TestIndexedEdgeList(unittest.TestCase):
+    """
+    Tests for IndexedEdgeList and the batched inspect_nodes function.
+    """
+    def test_matches_linear_scan(self):
+        """
+        Indexed lookups should return exactly what a plain edge list scan returns, in the same order.
+        """
+        edge_list = [(1, 2), (3, 1), (2, 3), (1, 4), (4, 4)]
+        indexed = IndexedEdgeList(edge_list)
+        for node in [1, 2, 3, 4, 99]:
+            self.assertEqual(inspect_node(network=indexed, node=node),
+                             inspect_node(network=edge_list, node=node),
+                             f"Indexed lookup differs from linear scan for node {node}")
+
+    def test_index_follows_mutations(self):
+        """
+        Appends after the first query are indexed, and other mutations do not leave a stale index.
+        """
+        indexed = IndexedEdgeList([(1, 2)])
+        self.assertEqual(indexed.edges_of(1), [(1, 2)])
+
+        indexed.append((2, 3))
+        indexed.extend([(1, 3)])
+        self.assertEqual(indexed.edges_of(1), [(1, 2), (1, 3)], "Appended edges should be indexed")
+        self.assertEqual(indexed.edges_of(3), [(2, 3), (1, 3)], "Appended edges should be indexed")
+
+        indexed.remove((1, 2))
+        self.assertEqual(indexed.edges_of(1), [(1, 3)], "Removed edges should no longer be returned")
+
+    def test_inspect_nodes(self):
+        """
+        inspect_nodes answers a batch of queries the same way as repeated inspect_node calls.
+        """
+        edge_list = [(10, 20), (20, 30), (10, 40)]
+        neighbour_dict = edge_to_neighbour_list_1(edge_list)
+        nodes = [10, 20, 99]
+        for network in (edge_list, IndexedEdgeList(edge_list), neighbour_dict):
+            expected = {node: inspect_node(network=network, node=node) for node in nodes}
+            self.assertEqual(inspect_nodes(network=network, nodes=nodes), expected,
+                             "Batched inspection should match individual inspect_node calls")
+
 class TestGetDegreeStatistics(unittest.TestCase):
     """
     Tests for the get_degree_statistics function, which accepts a neighbourlist dictionary and returns (max_degree, min_degree, average_degree, most_common_degree).
@@ -225,6 +307,45 @@ class TestGetDegreeStatistics(unittest.TestCase):
         self.assertEqual(result, expected,
             "Empty dictionary test failed: should yield (0,0,0.0,0) if no nodes exist.")
 
+class TestGetDegreeStatisticsFromFile(unittest.TestCase):
+    """
+    Tests for get_degree_statistics_from_file, which streams degree statistics straight from a TSV file.
+    """
+    def test_matches_neighbour_list_path(self):
+        """
+        With deduplication, the streamed statistics on the dolphins network should equal the ones computed via the neighbour list.
+        """
+        fName = "./data/dolphins.tsv"
+        expected = get_degree_statistics(edge_to_neighbour_list_1(file_to_edge_list(fName)))
+        self.assertEqual(get_degree_statistics_from_file(fName, deduplicate=True), expected,
+            "Streamed statistics should match get_degree_statistics on the dolphins network.")
+
+    @patch("builtins.open", new_callable=mock_open, read_data="1\t2\n2\t1\n1\t2\n\n2\t3\n")
+    def test_deduplicate(self, mock_file):
+        """
+        Repeated undirected edges are only counted once when deduplicate is set.
+        """
+        #Unique edges are (1,2) and (2,3): degrees 1 => 1, 2 => 2, 3 => 1.
+        result = get_degree_statistics_from_file("fake_path.tsv", deduplicate=True)
+        self.assertEqual(result, (2, 1, 4/3, 1), "Deduplicated statistics are incorrect.")
+
+    @patch("builtins.open", new_callable=mock_open, read_data="1\t2\n2\t1\n1\t2\n\n2\t3\n")
+    def test_no_deduplicate(self, mock_file):
+        """
+        Without deduplication every line counts towards its endpoints' degrees.
+        """
+        #Degrees: 1 => 3, 2 => 4, 3 => 1.
+        result = get_degree_statistics_from_file("fake_path.tsv")
+        self.assertEqual(result, (4, 1, 8/3, 3), "Raw streamed statistics are incorrect.")
+
+    @patch("builtins.open", new_callable=mock_open, read_data="")
+    def test_empty_file(self, mock_file):
+        """
+        An empty file should give (0, 0, 0.0, 0), as for an empty neighbour list.
+        """
+        self.assertEqual(get_degree_statistics_from_file("fake_path.tsv"), (0, 0, 0.0, 0),
+            "Empty file should yield (0,0,0.0,0).")
+
 class TestGetClusteringCoefficient(unittest.TestCase):
     """
     Tests for the get_clustering_coefficient function.
@@ -299,5 +420,617 @@ class TestGetClusteringCoefficient(unittest.TestCase):
         self.assertEqual(result, 0.0, 
             "Missing node in the network should yield 0.0 (or some default value).")
 
+class TestApproximateClustering(unittest.TestCase):
+    """
+    Tests for the sampling-based clustering estimators, checked against exact values on the dolphins network.
+    """
+    def setUp(self):
+        self.network = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+
+    def test_average_clustering_within_bound(self):
+        """
+        The estimated average clustering should be within the reported error of the exact average.
+        """
+        exact = sum(get_clustering_coefficient(network=self.network, node=n) for n in self.network) / len(self.network)
+        result = estimate_average_clustering(self.network, epsilon=0.02, seed=1)
+        self.assertLessEqual(result.error, 0.02, "Achieved error should meet the target")
+        self.assertAlmostEqual(result.estimate, exact, delta=result.error,
+            msg="Average clustering estimate outside its error bound")
+
+    def test_transitivity_within_bound(self):
+        """
+        The estimated transitivity should be within the reported error of the exact value.
+        """
+        closed = 0
+        wedges = 0
+        for node, neighbours in self.network.items():
+            k = len(neighbours)
+            wedges += k * (k - 1) // 2
+            closed += get_clustering_coefficient(network=self.network, node=node) * k * (k - 1) / 2
+        exact = closed / wedges
+        result = estimate_transitivity(self.network, epsilon=0.02, seed=1)
+        self.assertAlmostEqual(result.estimate, exact, delta=result.error,
+            msg="Transitivity estimate outside its error bound")
+
+    def test_local_clustering(self):
+        """
+        Small neighbourhoods are computed exactly; a hub in a large clique is sampled and stays within the bound.
+        """
+        result = estimate_clustering_coefficient(network=self.network, node=15)
+        self.assertEqual(result.estimate, get_clustering_coefficient(network=self.network, node=15))
+        self.assertEqual(result.error, 0.0, "Exact computation should report no error")
+
+        #Hub 0 joined to a 300-node ring: neighbours 1..300, each connected to the next one.
+        hub = {0: set(range(1, 301))}
+        for i in range(1, 301):
+            hub[i] = {0, i % 300 + 1, (i - 2) % 300 + 1}
+        exact = get_clustering_coefficient(network=hub, node=0)
+        result = estimate_clustering_coefficient(network=hub, node=0, epsilon=0.02, seed=1)
+        self.assertGreater(result.samples, 0, "Hub should be estimated by sampling")
+        self.assertAlmostEqual(result.estimate, exact, delta=result.error)
+
+    def test_invalid_epsilon(self):
+        """
+        An error target outside (0, 1) is rejected.
+        """
+        with self.assertRaises(ValueError):
+            estimate_transitivity(self.network, epsilon=0)
+
+class TestTraversal(unittest.TestCase):
+    """
+    Tests for BFS distances, connected components and the approximate diameter, over both neighbour lists and compact adjacency.
+    """
+    def setUp(self):
+        #A path 1-2-3-4 plus a separate edge 10-11.
+        self.neighbour_dict = edge_to_neighbour_list_1([(1, 2), (2, 3), (3, 4), (10, 11)])
+        self.compact = to_compact_adjacency(self.neighbour_dict)
+
+    def test_bfs_distances(self):
+        """
+        Hop distances from node 1 cover only its component, for both representations.
+        """
+        expected = {1: 0, 2: 1, 3: 2, 4: 3}
+        for network in (self.neighbour_dict, self.compact):
+            self.assertEqual(bfs_distances(network=network, source=1), expected,
+                             "BFS distances are incorrect")
+            self.assertEqual(bfs_distances(network=network, source=99), {},
+                             "Missing source should give no distances")
+            self.assertIsNone(shortest_path_length(network=network, source=1, target=10),
+                              "Unreachable target should give None")
+
+    def test_connected_components(self):
+        """
+        Components agree between BFS on either representation and union-find over the file.
+        """
+        expected = [{1, 2, 3, 4}, {10, 11}]
+        self.assertEqual(connected_components(self.neighbour_dict), expected)
+        self.assertEqual(connected_components(self.compact), expected)
+
+        with patch("builtins.open", mock_open(read_data="1\t2\n2\t3\n\n3\t4\n10\t11\n")):
+            self.assertEqual(connected_components_from_file("fake_path.tsv"), expected)
+
+    def test_approximate_diameter(self):
+        """
+        Double sweeps find the exact diameter of a path, and agree across representations on the dolphins network.
+        """
+        self.assertEqual(approximate_diameter(self.neighbour_dict, seed=1), 3)
+
+        dolphins = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        exact = max(max(bfs_distances(network=dolphins, source=n).values()) for n in dolphins)
+        estimate = approximate_diameter(to_compact_adjacency(dolphins), seed=1)
+        self.assertLessEqual(estimate, exact, "Approximate diameter must be a lower bound")
+        self.assertGreaterEqual(estimate, exact - 1, "Approximate diameter should be close to exact")
+
+class TestCompactRelabelling(unittest.TestCase):
+    """
+    Tests for loading straight into dense ids and for reordering them, while the public functions still use external ids.
+    """
+    @patch("builtins.open", new_callable=mock_open,
+           read_data="9000000000\t17\n17\t42\n42\t9000000000\n\n17\t9000000000\n42\t5\n")
+    def test_file_to_compact_adjacency(self, mock_file):
+        """
+        Sparse external ids get dense ids, repeated edges are dropped and lookups return external ids.
+        """
+        compact = file_to_compact_adjacency("fake_path.tsv")
+        neighbour_dict = edge_to_neighbour_list_1(
+            [(9000000000, 17), (17, 42), (42, 9000000000), (17, 9000000000), (42, 5)])
+
+        self.assertEqual(sorted(compact.index.values()), list(range(4)), "Ids should be dense 0..N-1")
+        self.assertEqual(len(compact.targets), 8, "Repeated edge should be stored once per direction")
+        self.assertEqual(get_degree_statistics(compact), get_degree_statistics(neighbour_dict))
+        for node in neighbour_dict:
+            self.assertEqual(inspect_node(network=compact, node=node), neighbour_dict[node])
+            self.assertAlmostEqual(get_clustering_coefficient(network=compact, node=node),
+                                   get_clustering_coefficient(network=neighbour_dict, node=node))
+
+    def test_relabel_orders(self):
+        """
+        Degree order puts the hub first, and every ordering keeps the same graph in external ids.
+        """
+        neighbour_dict = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        by_degree = to_compact_adjacency(neighbour_dict, order='degree')
+        hub = max(neighbour_dict, key=lambda n: len(neighbour_dict[n]))
+        self.assertEqual(len(neighbour_dict[by_degree.nodes[0]]), len(neighbour_dict[hub]),
+                         "Highest-degree node should get id 0")
+
+        for order in ('degree', 'bfs'):
+            relabelled = relabel_compact_adjacency(to_compact_adjacency(neighbour_dict), order)
+            for node in neighbour_dict:
+                self.assertEqual(inspect_node(network=relabelled, node=node), neighbour_dict[node],
+                                 f"Relabelling by {order} changed the neighbours of {node}")
+
+        with self.assertRaises(ValueError):
+            relabel_compact_adjacency(by_degree, 'random')
+
+class TestBitsetAdjacency(unittest.TestCase):
+    """
+    Tests for BitsetAdjacency, checked against the neighbour dictionary it is built from.
+    """
+    def setUp(self):
+        self.neighbour_dict = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        self.bitsets = BitsetAdjacency(self.neighbour_dict)
+
+    def test_matches_neighbour_dict(self):
+        """
+        inspect_node, get_degree_statistics and get_clustering_coefficient agree with the dict-of-sets results.
+        """
+        self.assertEqual(get_degree_statistics(self.bitsets), get_degree_statistics(self.neighbour_dict))
+        for node in list(self.neighbour_dict) + [999]:
+            self.assertEqual(inspect_node(network=self.bitsets, node=node),
+                             inspect_node(network=self.neighbour_dict, node=node))
+            self.assertAlmostEqual(get_clustering_coefficient(network=self.bitsets, node=node),
+                                   get_clustering_coefficient(network=self.neighbour_dict, node=node))
+
+    def test_self_loop(self):
+        """
+        A self-loop counts towards degree but not towards edges between neighbours, as with sets.
+        """
+        neighbour_dict = edge_to_neighbour_list_1([(1, 1), (1, 2), (1, 3), (2, 3), (3, 3)])
+        bitsets = BitsetAdjacency(neighbour_dict)
+        for node in (1, 2, 3):
+            self.assertAlmostEqual(get_clustering_coefficient(network=bitsets, node=node),
+                                   get_clustering_coefficient(network=neighbour_dict, node=node))
+
+    def test_edge_to_adjacency_density(self):
+        """
+        Dense graphs get bitsets, sparse graphs keep the neighbour dictionary.
+        """
+        clique = [(a, b) for a in range(10) for b in range(a + 1, 10)]
+        self.assertIsInstance(edge_to_adjacency(clique), BitsetAdjacency)
+        self.assertIsInstance(edge_to_adjacency(file_to_edge_list("./data/dolphins.tsv")), dict)
+
+class TestMemoisedNetwork(unittest.TestCase):
+    """
+    Tests for MemoisedNetwork caching and invalidation.
+    """
+    def test_hits_and_invalidation(self):
+        """
+        Repeated queries hit the cache, and edge changes only drop entries they affect while results stay correct.
+        """
+        #Square 1-2-3-4 with diagonal 1-3, plus a separate edge 10-11.
+        graph = MemoisedNetwork(edge_to_neighbour_list_1([(1, 2), (2, 3), (3, 4), (4, 1), (1, 3), (10, 11)]))
+        for node in (1, 2, 3, 4, 10):
+            graph.clustering_coefficient(node)
+        graph.degree_statistics()
+        self.assertEqual(graph.cache_info()[:3], (0, 6, 5))
+
+        graph.clustering_coefficient(1)
+        graph.degree_statistics()
+        self.assertEqual(graph.cache_info()[:2], (2, 6), "Repeated queries should hit the cache")
+
+        #Adding 2-4 affects 2, 4 and their common neighbours 1 and 3, but not 10.
+        graph.add_edge(2, 4)
+        self.assertEqual(graph.cache_info()[2], 1, "Only node 10 should remain cached")
+        for node in (1, 2, 3, 4, 10):
+            self.assertEqual(graph.clustering_coefficient(node),
+                             get_clustering_coefficient(network=graph.network, node=node))
+        self.assertEqual(graph.degree_statistics(), get_degree_statistics(graph.network))
+
+        graph.remove_edge(1, 3)
+        self.assertEqual(graph.clustering_coefficient(2), get_clustering_coefficient(network=graph.network, node=2))
+        with self.assertRaises(KeyError):
+            graph.remove_edge(1, 3)
+
+    def test_bounded_size(self):
+        """
+        The clustering cache never grows beyond max_size.
+        """
+        graph = MemoisedNetwork(edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv")), max_size=10)
+        for node in list(graph.network):
+            graph.clustering_coefficient(node)
+        self.assertEqual(graph.cache_info()[2], 10)
+
+class TestLinkPrediction(unittest.TestCase):
+    """
+    Tests for batched link-prediction scores, checked against set-based definitions on the dolphins network.
+    """
+    def setUp(self):
+        self.network = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        self.pairs = [(u, v) for u in self.network for v in self.network if u < v]
+
+    def expected(self, method, u, v):
+        common = self.network[u] & self.network[v]
+        if method == 'common_neighbours':
+            return len(common)
+        if method == 'jaccard':
+            return len(common) / len(self.network[u] | self.network[v])
+        return sum(1 / math.log(len(self.network[w])) for w in common)
+
+    def test_score_pairs(self):
+        """
+        Every method matches its set-based definition, and missing nodes score 0.
+        """
+        for method in ('common_neighbours', 'jaccard', 'adamic_adar'):
+            scores = score_pairs(network=self.network, pairs=self.pairs, method=method)
+            for (u, v), score in zip(self.pairs, scores):
+                self.assertAlmostEqual(score, self.expected(method, u, v), msg=f"{method} wrong for {(u, v)}")
+        self.assertEqual(score_pairs(network=self.network, pairs=[(1, 999)]), [0])
+        for method, score_type in (('common_neighbours', int), ('jaccard', float), ('adamic_adar', float)):
+            scores = score_pairs(network=self.network, pairs=self.pairs[:50] + [(1, 999)], method=method)
+            self.assertTrue(all(type(score) is score_type for score in scores), f"{method} scores are not all {score_type}")
+        with self.assertRaises(ValueError):
+            score_pairs(network=self.network, pairs=self.pairs, method='cosine')
+
+    def test_parallel_chunks(self):
+        """
+        Scoring in a process pool returns the same scores, in order.
+        """
+        sequential = score_pairs(network=self.network, pairs=self.pairs, method='adamic_adar')
+        parallel = score_pairs(network=self.network, pairs=self.pairs, method='adamic_adar',
+                               workers=2, chunk_size=500)
+        self.assertEqual(parallel, sequential)
+
+    def test_top_k_similar(self):
+        """
+        Top-k results agree with brute-force scoring of all non-neighbours.
+        """
+        for method in ('common_neighbours', 'jaccard', 'adamic_adar'):
+            result = top_k_similar(network=self.network, nodes=[14, 999], k=5, method=method)
+            self.assertEqual(result[999], [])
+            brute = sorted((self.expected(method, 14, v) for v in self.network
+                            if v != 14 and v not in self.network[14]), reverse=True)[:5]
+            self.assertEqual(len(result[14]), 5)
+            for (node, score), expected in zip(result[14], brute):
+                self.assertNotIn(node, self.network[14])
+                self.assertAlmostEqual(score, expected)
+
+class TestDiskAdjacency(unittest.TestCase):
+    """
+    Tests for the out-of-core adjacency file, checked against the in-memory neighbour list.
+    """
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "graph.adj")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_neighbour_list(self):
+        """
+        With many small sorted runs, the merged file gives the same answers as the neighbour list.
+        """
+        fName = "./data/dolphins.tsv"
+        neighbour_dict = edge_to_neighbour_list_1(file_to_edge_list(fName))
+        build_disk_adjacency(fName, self.path, run_edges=16, tmp_dir=self.tmp.name)
+
+        with DiskAdjacency(self.path) as disk:
+            self.assertEqual(len(disk), len(neighbour_dict))
+            self.assertEqual(get_degree_statistics(disk), get_degree_statistics(neighbour_dict))
+            for node in list(neighbour_dict) + [999]:
+                self.assertEqual(inspect_node(network=disk, node=node),
+                                 inspect_node(network=neighbour_dict, node=node))
+                self.assertAlmostEqual(get_clustering_coefficient(network=disk, node=node),
+                                       get_clustering_coefficient(network=neighbour_dict, node=node))
+        self.assertEqual(os.listdir(self.tmp.name), ["graph.adj"], "Temporary runs should be removed")
+
+    def test_neighbours_outlive_close(self):
+        """
+        Neighbour arrays kept by the caller stay valid after the file is closed, and closing does not fail.
+        """
+        fName = os.path.join(self.tmp.name, "edges.tsv")
+        with open(fName, "w") as f:
+            f.write("1\t2\n1\t3\n")
+        build_disk_adjacency(fName, self.path)
+        with DiskAdjacency(self.path) as disk:
+            nb = disk.neighbours(1)
+            missing = disk.neighbours(99)
+        self.assertEqual(list(nb), [2, 3])
+        self.assertEqual(list(missing), [])
+        self.assertTrue(disk._file.closed)
+
+    def test_bounded_fan_in(self):
+        """
+        With more runs than the fan-in, runs are merged in several passes without opening more than fan_in at once.
+        """
+        fName = "./data/dolphins.tsv"
+        neighbour_dict = edge_to_neighbour_list_1(file_to_edge_list(fName))
+        read_run = network._read_run
+        open_runs = [0, 0]  #Currently open, most open at once.
+
+        def counting_read_run(path):
+            open_runs[0] += 1
+            open_runs[1] = max(open_runs[1], open_runs[0])
+            try:
+                yield from read_run(path)
+            finally:
+                open_runs[0] -= 1
+
+        with patch("network._read_run", counting_read_run):
+            build_disk_adjacency(fName, self.path, run_edges=2, tmp_dir=self.tmp.name, fan_in=3)
+
+        self.assertLessEqual(open_runs[1], 3)
+        with DiskAdjacency(self.path) as disk:
+            self.assertEqual(get_degree_statistics(disk), get_degree_statistics(neighbour_dict))
+            for node in neighbour_dict:
+                self.assertEqual(inspect_node(network=disk, node=node),
+                                 inspect_node(network=neighbour_dict, node=node))
+        self.assertEqual(os.listdir(self.tmp.name), ["graph.adj"], "Temporary runs should be removed")
+
+        with self.assertRaises(ValueError):
+            build_disk_adjacency(fName, self.path, fan_in=1)
+
+    def test_duplicates_self_loops_and_empty(self):
+        """
+        Repeated edges are stored once, self-loops once, and an empty file gives an empty graph.
+        """
+        fName = os.path.join(self.tmp.name, "edges.tsv")
+        with open(fName, "w") as f:
+            f.write("1\t2\n2\t1\n\n3\t3\n1\t3\n")
+        self.assertEqual(build_disk_adjacency(fName, self.path), (3, 5))
+        with DiskAdjacency(self.path) as disk:
+            self.assertEqual(list(disk.neighbours(3)), [1, 3])
+
+        with open(fName, "w") as f:
+            f.write("")
+        build_disk_adjacency(fName, self.path)
+        with DiskAdjacency(self.path) as disk:
+            self.assertEqual(get_degree_statistics(disk), (0, 0, 0.0, 0))
+
+        with self.assertRaises(ValueError):
+            DiskAdjacency(fName)
+
+class TestParallelLoading(unittest.TestCase):
+    """
+    Tests for the parallel chunked TSV loaders, checked against file_to_edge_list.
+    """
+    def test_matches_serial_loader(self):
+        """
+        Tiny chunks force many newline-aligned ranges across worker processes; results match the serial loader.
+        """
+        fName = "./data/dolphins.tsv"
+        expected = file_to_edge_list(fName)
+        self.assertEqual(file_to_edge_list_parallel(fName, workers=2, chunk_bytes=100), expected)
+        sources, dests = file_to_edge_arrays(fName, workers=1, chunk_bytes=7)
+        self.assertEqual(list(zip(sources, dests)), expected)
+        self.assertEqual(file_to_neighbour_list_parallel(fName, workers=2, chunk_bytes=100),
+                         edge_to_neighbour_list_1(expected))
+
+    def test_blank_lines_and_errors(self):
+        """
+        Blank lines are skipped, and malformed lines raise ValueError as in file_to_edge_list.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            fName = os.path.join(tmp, "edges.tsv")
+            with open(fName, "w") as f:
+                f.write("1\t2\n\n\n3\t4")
+            self.assertEqual(file_to_edge_list_parallel(fName, workers=2, chunk_bytes=3), [(1, 2), (3, 4)])
+
+            with open(fName, "w") as f:
+                f.write("1\t2\n3 4\n")
+            with self.assertRaises(ValueError):
+                file_to_edge_list(fName)
+            with self.assertRaises(ValueError):
+                file_to_edge_list_parallel(fName, workers=2, chunk_bytes=3)
+
+class TestCentrality(unittest.TestCase):
+    """
+    Tests for PageRank and eigenvector centrality.
+    """
+    def reference_pagerank(self, network, damping=0.85, iterations=200):
+        """
+        Straightforward dict-based PageRank to compare against.
+        """
+        n = len(network)
+        rank = {node: 1 / n for node in network}
+        for _ in range(iterations):
+            dangling = sum(rank[u] for u in network if not network[u])
+            new_rank = {node: (1 - damping) / n + damping * dangling / n for node in network}
+            for u in network:
+                for v in network[u]:
+                    new_rank[v] += damping * rank[u] / len(network[u])
+            rank = new_rank
+        return rank
+
+    def test_pagerank(self):
+        """
+        PageRank sums to 1 and matches the reference, including a dangling (isolated) node.
+        """
+        network = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        network[999] = set()
+        result = pagerank(network)
+        self.assertAlmostEqual(sum(result.values()), 1.0)
+        expected = self.reference_pagerank(network)
+        for node in network:
+            self.assertAlmostEqual(result[node], expected[node], places=8)
+
+        #A warm start from the converged answer gives the same answer.
+        warm = pagerank(to_compact_adjacency(network), initial=result)
+        for node in network:
+            self.assertAlmostEqual(warm[node], result[node], places=8)
+
+    def test_eigenvector_centrality(self):
+        """
+        On the path 1-2-3 the centrality is (1/2, 1/sqrt(2), 1/2), even though the graph is bipartite.
+        """
+        result = eigenvector_centrality(edge_to_neighbour_list_1([(1, 2), (2, 3)]))
+        self.assertAlmostEqual(result[1], 0.5, places=6)
+        self.assertAlmostEqual(result[2], 1 / math.sqrt(2), places=6)
+        self.assertAlmostEqual(result[3], 0.5, places=6)
+        self.assertEqual(eigenvector_centrality({}), {})
+
+    def test_zero_warm_start(self):
+        """
+        An all-zero warm start falls back to a uniform start instead of returning the zero vector.
+        """
+        network = edge_to_neighbour_list_1([(1, 2), (2, 3)])
+        result = eigenvector_centrality(network, initial={1: 0.0, 2: 0.0, 3: 0.0})
+        self.assertAlmostEqual(result[2], 1 / math.sqrt(2), places=6)
+        self.assertAlmostEqual(sum(pagerank(network, initial={1: 0.0, 2: 0.0, 3: 0.0}).values()), 1.0)
+
+    def test_without_numpy(self):
+        """
+        The pure Python iteration gives the same results as the NumPy one.
+        """
+        network = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        network[999] = set()
+        expected = (pagerank(network), eigenvector_centrality(network))
+        with patch("network.np", None):
+            result = (pagerank(network), eigenvector_centrality(network))
+        for expected_scores, scores in zip(expected, result):
+            self.assertEqual(set(scores), set(expected_scores))
+            for node in network:
+                self.assertAlmostEqual(scores[node], expected_scores[node], places=8)
+
+    def test_no_convergence(self):
+        """
+        Running out of iterations raises RuntimeError.
+        """
+        network = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        with self.assertRaises(RuntimeError):
+            pagerank(network, max_iter=2)
+
+class TestCommunityDetection(unittest.TestCase):
+    """
+    Tests for modularity, label propagation and Louvain.
+    """
+    def setUp(self):
+        #Two 5-cliques (0-4 and 10-14) joined by the single edge 4-10.
+        edges = [(a, b) for a in range(5) for b in range(a + 1, 5)]
+        edges += [(a + 10, b + 10) for (a, b) in edges] + [(4, 10)]
+        self.cliques = edge_to_neighbour_list_1(edges)
+        self.expected_split = [set(range(5)), set(range(10, 15))]
+
+    def communities(self, labels):
+        groups = {}
+        for node, label in labels.items():
+            groups.setdefault(label, set()).add(node)
+        return sorted(groups.values(), key=min)
+
+    def test_modularity(self):
+        """
+        Everything in one community scores 0; the two-clique split scores the known value.
+        """
+        self.assertAlmostEqual(modularity(self.cliques, {node: 0 for node in self.cliques}), 0.0)
+        split = {node: int(node >= 10) for node in self.cliques}
+        #21 edges: 20 internal, each side has total degree 21.
+        self.assertAlmostEqual(modularity(self.cliques, split), 20 / 21 - 2 * (21 / 42) ** 2)
+
+    def test_finds_cliques(self):
+        """
+        Both methods separate the two cliques and report the modularity of their labels.
+        """
+        for method in (label_propagation, louvain):
+            labels, score = method(self.cliques, seed=3)
+            self.assertEqual(self.communities(labels), self.expected_split, f"{method.__name__} failed")
+            self.assertAlmostEqual(score, modularity(self.cliques, labels))
+
+    def test_seeded_dolphins(self):
+        """
+        Results are reproducible for a seed, and Louvain reaches a good modularity on the dolphins network.
+        """
+        dolphins = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        self.assertEqual(louvain(dolphins, seed=1), louvain(dolphins, seed=1))
+        self.assertEqual(label_propagation(dolphins, seed=1), label_propagation(dolphins, seed=1))
+        self.assertGreater(louvain(to_compact_adjacency(dolphins), seed=1)[1], 0.5)
+
+class TestKCores(unittest.TestCase):
+    """
+    Tests for core decomposition, k-core pruning and ordering-based triangle counting.
+    """
+    def setUp(self):
+        #A 4-clique (1-4) with a tail 4-5-6 and a self-loop on 6.
+        edges = [(a, b) for a in range(1, 5) for b in range(a + 1, 5)] + [(4, 5), (5, 6), (6, 6)]
+        self.network = edge_to_neighbour_list_1(edges)
+
+    def test_core_numbers(self):
+        """
+        Clique nodes are in the 3-core and tail nodes in the 1-core; the ordering is a degeneracy ordering.
+        """
+        cores, ordering = core_decomposition(self.network)
+        self.assertEqual(cores, {1: 3, 2: 3, 3: 3, 4: 3, 5: 1, 6: 1})
+        self.assertEqual(sorted(ordering), sorted(self.network))
+        rank = {node: i for i, node in enumerate(ordering)}
+        for node in self.network:
+            later = [v for v in self.network[node] if v != node and rank[v] > rank[node]]
+            self.assertLessEqual(len(later), max(cores.values()))
+        self.assertEqual(set(k_core(self.network, 3)), {1, 2, 3, 4})
+        self.assertEqual(k_core(self.network, 3)[4], {1, 2, 3})
+
+    def test_core_numbers_dolphins(self):
+        """
+        On the dolphins network every node in the k-core has at least k neighbours inside it.
+        """
+        dolphins = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        cores, _ = core_decomposition(dolphins)
+        for k in range(1, max(cores.values()) + 1):
+            core = k_core(dolphins, k, cores)
+            self.assertTrue(core, f"{k}-core should not be empty")
+            self.assertTrue(all(len(neighbours) >= k for neighbours in core.values()))
+
+    def test_triangles_and_clustering(self):
+        """
+        Triangle counts are exact and all-node clustering matches get_clustering_coefficient.
+        """
+        self.assertEqual(count_triangles(self.network), {1: 3, 2: 3, 3: 3, 4: 3, 5: 0, 6: 0})
+        dolphins = edge_to_neighbour_list_1(file_to_edge_list("./data/dolphins.tsv"))
+        for network in (self.network, dolphins):
+            result = get_all_clustering_coefficients(network)
+            for node in network:
+                self.assertAlmostEqual(result[node], get_clustering_coefficient(network=network, node=node))
+
+class TestNormaliseEdges(unittest.TestCase):
+    """
+    Tests for the edge-list normalisation stage.
+    """
+    def test_normalise_edge_list(self):
+        """
+        Reversed and repeated edges collapse to one sorted (min, max) edge and self-loops are counted and dropped.
+        """
+        edge_list = [(3, 1), (1, 3), (2, 2), (5, -4), (1, 3), (-4, 5), (2, 1)]
+        result, stats = normalise_edge_list(edge_list)
+        self.assertEqual(result, [(-4, 5), (1, 2), (1, 3)])
+        self.assertEqual(stats, (7, 1, 3, 3))
+
+        result, stats = normalise_edge_list(edge_list, remove_self_loops=False)
+        self.assertEqual(result, [(-4, 5), (1, 2), (1, 3), (2, 2)])
+        self.assertEqual(stats, (7, 0, 3, 4))
+
+        self.assertEqual(normalise_edge_list([]), ([], (0, 0, 0, 0)))
+
+    def test_without_numpy(self):
+        """
+        The pure Python sort gives the same normalised edges and stats as the NumPy one.
+        """
+        edge_list = file_to_edge_list("./data/dolphins.tsv") + [(3, 3), (7, -2), (-2, 7)]
+        for remove_self_loops in (True, False):
+            expected = normalise_edge_list(edge_list, remove_self_loops)
+            expected_file = file_to_normalised_edges("./data/dolphins.tsv", remove_self_loops)
+            with patch("network.np", None):
+                self.assertEqual(normalise_edge_list(edge_list, remove_self_loops), expected)
+                self.assertEqual(file_to_normalised_edges("./data/dolphins.tsv", remove_self_loops), expected_file)
+
+    def test_dolphins(self):
+        """
+        Normalised dolphin edges give the same neighbour list, with the duplicates in the file removed.
+        """
+        fName = "./data/dolphins.tsv"
+        edge_list = file_to_edge_list(fName)
+        sources, dests, stats = file_to_normalised_edges(fName)
+        edges = list(zip(sources, dests))
+        self.assertEqual(edges, sorted(set(edges)), "Edges should be sorted and unique")
+        self.assertEqual(edge_to_neighbour_list_1(edges), edge_to_neighbour_list_1(edge_list))
+        self.assertEqual(stats.input_edges, len(edge_list))
+        self.assertGreater(stats.duplicates, 0, "The dolphins file contains repeated edges")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,66 @@
+#File: test_simulation.py
+#Author: Taylor King
+#Description: Tests the Monte Carlo tournament simulation: seeded reproducibility, parallel vs sequential agreement and aggregation.
+
+from simulation import *
+
+def test_seeded_tournament_reproducible():
+    """
+    Test that a Tournament seeded with the same value draws the same sponsors and budgets, and produces the same champion.
+    """
+    print("Running seeded tournament tests...")
+
+    first = run_tournament('./data/config.json', seed=42)
+    second = run_tournament('./data/config.json', seed=42)
+    assert first == second, "Same seed gave different tournaments."
+
+    seeds = run_seeds(5, base_seed=7)
+    assert seeds == run_seeds(5, base_seed=7), "Run seeds are not reproducible."
+    assert len(set(seeds)) == 5, "Run seeds are not distinct."
+
+    print("Seeded tournament tests passed.")
+
+def test_parallel_matches_sequential():
+    """
+    Test that a simulation spread across worker processes aggregates to the same summary as a sequential one.
+    """
+    print("Running parallel simulation tests...")
+
+    sequential = simulate(n_runs=12, base_seed=3, max_workers=1)
+    parallel = simulate(n_runs=12, base_seed=3, max_workers=2, chunk_size=5)
+
+    assert sequential.runs == parallel.runs == 12, "Wrong number of runs."
+    assert sequential.champion_counts == parallel.champion_counts, "Champion counts differ."
+    assert sorted(sequential.champion_scores) == sorted(parallel.champion_scores), "Champion scores differ."
+    assert sequential.win_rates() == parallel.win_rates(), "Win rates differ."
+
+    print("Parallel simulation tests passed.")
+
+def test_simulation_summary():
+    """
+    Test aggregation of champion frequencies, win rates and partial results streamed through the progress callback.
+    """
+    print("Running simulation summary tests...")
+
+    partial = []
+    summary = simulate(n_runs=6, base_seed=1, max_workers=1, progress=lambda s, r: partial.append(s.runs))
+    assert partial == [1, 2, 3, 4, 5, 6], "Progress was not reported after every run."
+
+    assert abs(sum(summary.champion_frequency().values()) - 1) < 1e-9, "Champion frequencies do not sum to one."
+    rates = summary.win_rates()
+    assert sum(rate['entries'] for rate in rates.values()) == 6 * 16, "Entries do not match teams per run."
+    assert sum(rate['titles'] for rate in rates.values()) == 6, "One title per run expected."
+    for rate in rates.values():
+        assert 0 <= rate['title_rate'] <= 1 and 0 <= rate['match_win_rate'] <= 1, "Rate out of range."
+
+    distribution = summary.score_distribution()
+    assert distribution['min'] <= distribution['median'] <= distribution['max'], "Score distribution inconsistent."
+    assert SimulationSummary().score_distribution() == {}, "Empty summary should have no distribution."
+
+    print("Simulation summary tests passed.")
+
+#Run the test.
+if __name__ == '__main__':
+    test_seeded_tournament_reproducible()
+    test_parallel_matches_sequential()
+    test_simulation_summary()
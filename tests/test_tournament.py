@@ -2,8 +2,12 @@
 #Author: Taylor King
 #Description: This file contains unit tests for the Tournament class, applying a TDD approach, ensuring the Tournament class initialisation and attribute loading from config.json functions correctly.
 
+import contextlib
+import io
 import json
-from tournament import Tournament
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from tournament import Tournament, Tournament_large, CarCatalog
 
 #Test initialisation.
 def test_init():
@@ -391,6 +395,216 @@ def test_hold_event():
 
     print("hold_event tests passed.")
 
+#Tournament whose winners keep £100,000 in reserve when buying, a custom purchase strategy (module level so process pools can pickle it).
+class ReserveTournament(Tournament):
+    def _choose_single_car(self, team):
+        return self.catalog.best_affordable(team.sponsor, team.budget - 100000)
+
+#Tournament counting calls to its purchase hook.
+class CountingTournament(Tournament):
+    purchases = 0
+
+    def _purchase_single_car(self, team):
+        CountingTournament.purchases += 1
+        super()._purchase_single_car(team)
+
+def test_hold_event_executor():
+    """
+    Test that choosing each round's purchases through a thread or process pool gives the same bracket as running them sequentially,
+    and that the purchase hooks are used either way.
+    """
+    print("Running hold_event executor tests...")
+
+    def run(cls, executor=None, chunksize=1):
+        tournament = cls('./data/config.json', seed=11)
+        tournament.generate_sponsors(sponsor_list=['Tesla', 'Ford', 'BMW', 'Honda'])
+        tournament.generate_teams()
+        tournament.buy_cars()
+        tournament.hold_event(executor=executor, workers=2, chunksize=chunksize)
+        return [(team.sponsor, team.budget, team.inventory, team.performance, team.active) for team in tournament.teams], \
+            tournament.teams.index(tournament.champion)
+
+    for cls in [Tournament, ReserveTournament]:
+        expected = run(cls)
+        assert run(cls, ThreadPoolExecutor) == expected, "Thread pool bracket differs from sequential."
+        assert run(cls, ProcessPoolExecutor, chunksize=3) == expected, "Process pool bracket differs from sequential."
+
+    #The custom strategy is used: winners never spend below the reserve.
+    assert run(ReserveTournament) != run(Tournament), "Purchase strategy override ignored."
+
+    #Every match winner goes through _purchase_single_car, with or without a pool.
+    for executor in [None, ThreadPoolExecutor]:
+        CountingTournament.purchases = 0
+        run(CountingTournament, executor)
+        assert CountingTournament.purchases == 15, "_purchase_single_car not called once per match."
+
+    print("hold_event executor tests passed.")
+
+def test_car_catalog():
+    """
+    Test CarCatalog parsing, indexing by Make, ratio ordering, and sharing between Tournaments using the same file.
+    """
+    print("Running CarCatalog tests...")
+
+    #Setup fake car data in a separate file, leaving cars_modified.csv untouched.
+    car_data_path = './data/cars_catalog_test.csv'
+    with open(car_data_path, 'w') as f:
+        f.write('Make,Model,Cost,MPG-H\n')
+        f.write('Tesla,Model S,40000,120\n')
+        f.write('Tesla,Model 3,35000,130\n')
+        f.write('Ford,Fusion,25000,40\n')
+
+    catalog = CarCatalog.load(car_data_path)
+
+    #Typed columns and indexes.
+    assert [car['Model'] for car in catalog.cars('Tesla')] == ['Model S', 'Model 3'], "File order not kept."
+    assert [car['Model'] for car in catalog.cars_by_ratio('Tesla')] == ['Model 3', 'Model S'], "Ratio ordering incorrect."
+    assert catalog.cars('Tesla')[0]['Cost'] == 40000, "Cost should be an integer."
+    assert catalog.cars('Kia') == [], "Unknown make should have no cars."
+    assert catalog.mpg('Fusion') == 40 and catalog.mpg('Unknown') == 0, "Model -> MPG-H map incorrect."
+
+    #Tournaments on the same unchanged file share one catalog.
+    t1 = Tournament('./data/config.json')
+    t2 = Tournament('./data/config2.json')
+    t1.car_data_path = t2.car_data_path = car_data_path
+    assert t1.catalog is t2.catalog is catalog, "Catalog should be shared across Tournaments."
+
+    #Pointing a Tournament at another file after its catalog was loaded switches catalog.
+    t3 = Tournament('./data/config.json')
+    assert t3.catalog.car_data_path == t3.car_data_path, "Catalog not loaded from car_data_path."
+    t3.car_data_path = car_data_path
+    assert t3.catalog is catalog, "Catalog not reloaded after car_data_path changed."
+
+    #Changing the file gives a freshly parsed catalog.
+    with open(car_data_path, 'a') as f:
+        f.write('BMW,i3,30000,100\n')
+    assert CarCatalog.load(car_data_path).mpg('i3') == 100, "Catalog not reloaded after the file changed."
+
+    os.remove(car_data_path)
+
+    print("CarCatalog tests passed.")
+
+def test_best_affordable():
+    """
+    Test that the binary-searched best affordable car matches a linear scan of the ratio-sorted cars.
+    """
+    print("Running best affordable car tests...")
+
+    #Setup fake car data whose cheapest cars are not the best ratio.
+    car_data_path = './data/cars_affordable_test.csv'
+    with open(car_data_path, 'w') as f:
+        f.write('Make,Model,Cost,MPG-H\n')
+        f.write('Tesla,Model 3,35000,130\n')
+        f.write('Tesla,Model S,60000,150\n')
+        f.write('Tesla,Model Y,20000,60\n')
+        f.write('Tesla,Roadster,90000,100\n')
+        f.write('Tesla,Cybertruck,30000,40\n')
+        f.write('Ford,Fusion,25000,40\n')
+
+    catalog = CarCatalog.load(car_data_path)
+    for make in ['Tesla', 'Ford', 'Kia']:
+        for budget in range(0, 100001, 2500):
+            expected = next((car for car in catalog.cars_by_ratio(make) if car['Cost'] <= budget), None)
+            assert catalog.best_affordable(make, budget) is expected, f"Wrong car for {make} on {budget}."
+
+    car_id = catalog.best_affordable_id(catalog.make_index['Tesla'], 34999)
+    assert catalog.car_models[car_id] == 'Model Y', "Car id lookup incorrect."
+    assert catalog.best_affordable_id(catalog.make_index['Ford'], 24999) is None, "Nothing should be affordable."
+
+    os.remove(car_data_path)
+
+    print("Best affordable car tests passed.")
+
+def test_team_running_total_mpg():
+    """
+    Test that Team keeps a running MPG-H total as cars are appended or the inventory is replaced.
+    """
+    print("Running Team running total tests...")
+
+    mpg = {'Model 3': 130, 'Model S': 120, 'i3': 100}
+    team = Tournament.Team('Tesla', 50000, mpg_lookup=lambda model: mpg.get(model, 0))
+    assert team.total_mpg == 0, "New team should have no MPG-H."
+
+    team.inventory.append('Model 3')
+    team.inventory.extend(['Model S', 'Unknown'])
+    assert team.total_mpg == 250, "Appended cars not added to the running total."
+
+    team.inventory = ['i3', 'i3']
+    assert team.total_mpg == 200, "Replacing the inventory should recompute the total."
+
+    team.inventory.remove('i3')
+    assert team.total_mpg == 100, "Removing a car should update the total."
+
+    #A team without a lookup is attached to the Tournament's catalog when first scored.
+    tournament = Tournament('./data/config.json')
+    other = tournament.Team('Tesla', 50000)
+    other.inventory.append('Model 3')
+    assert tournament._team_total_mpg(other) == tournament.catalog.mpg('Model 3'), "Team score incorrect."
+
+    print("Team running total tests passed.")
+
+def test_large_bracket():
+    """
+    Test that Tournament_large plays the same bracket as Tournament, and scales beyond 16 teams with sponsors drawn from the catalog.
+    """
+    print("Running large bracket tests...")
+
+    #Setup fake car data with several cars per make in a separate file.
+    car_data_path = './data/cars_large_test.csv'
+    with open(car_data_path, 'w') as f:
+        f.write('Make,Model,Cost,MPG-H\n')
+        for make in ['Tesla', 'Ford', 'BMW', 'Honda', 'Kia']:
+            for i in range(6):
+                f.write(f'{make},{make} {i},{12000 + 7000 * i + 1000 * len(make)},{30 + (17 * i + len(make)) % 50}\n')
+
+    #The same sponsors and budgets give the same purchases, matches and champion as Tournament.
+    large = Tournament_large('./data/config.json', seed=5)
+    large.car_data_path = car_data_path
+    large.generate_sponsors()
+    large.generate_teams()
+    large.buy_cars()
+    large.hold_event()
+
+    tournament = Tournament('./data/config.json')
+    tournament.car_data_path = car_data_path
+    tournament.sponsors = large.sponsors
+    tournament.budgets = list(large.budgets)
+    tournament.generate_teams()
+    tournament.buy_cars()
+    tournament.hold_event()
+
+    for team, view in zip(tournament.teams, large.teams):
+        assert (team.sponsor, team.budget, team.inventory, team.total_mpg, team.active) == \
+            (view.sponsor, view.budget, view.inventory, view.total_mpg, view.active), "Team state differs from Tournament."
+        assert team.performance == view.performance, "Performance record differs from Tournament."
+    assert tournament.teams.index(tournament.champion) == large.champion.index, "Champion differs from Tournament."
+
+    #More teams than makers: sponsors are drawn from the catalog with replacement.
+    large = Tournament_large('./data/config.json', seed=5, nteams=2**12)
+    large.car_data_path = car_data_path
+    large.generate_sponsors(sponsor_list=['Kia'], fixed_budget=30000)
+    large.generate_teams()
+    large.buy_cars()
+    large.hold_event(executor=ThreadPoolExecutor, workers=2)
+
+    assert len(large.teams) == 2**12 and large.sponsors[0] == 'Kia', "Sponsors not generated."
+    assert set(large.sponsors) <= set(large.catalog.makes), "Sponsor not drawn from the catalog."
+    assert sum(large.teams.wins) == sum(large.teams.losses) == 2**12 - 1, "Every match needs one winner and one loser."
+    assert large.champion.performance['wins'] == 12 and large.champion.active, "Champion should win every round."
+    assert sum(large.teams.active) == 1, "Only the champion should remain active."
+    assert len(large.champion.performance['scores']) == 12, "Champion should have a score for every win."
+
+    #The win record has one row per team, even with repeated sponsors.
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        large.show_win_record()
+    rows = output.getvalue().strip().split('\n')[2:]
+    assert len(rows) == 2**12, "Win record should have one row per team."
+    assert sum(row.count("'W") for row in rows) == 2**12 - 1, "Win record does not match the wins."
+
+    os.remove(car_data_path)
+
+    print("Large bracket tests passed.")
 
 if __name__ == '__main__':
     test_init()
@@ -404,3 +618,8 @@ if __name__ == '__main__':
     test_buy_cars()
     test_purchase_inventory()
     test_hold_event()
+    test_hold_event_executor()
+    test_car_catalog()
+    test_best_affordable()
+    test_team_running_total_mpg()
+    test_large_bracket()
@@ -3,6 +3,7 @@
 #Description: Tests the performance of greedy vs dp.
 
 from tournament import *
+import os
 import random
 
 def test_optimised_vs_greedy():
@@ -46,6 +47,110 @@ def test_optimised_vs_greedy():
 
     print("Tournament Optimisation Tests Passed.")
 
+def reference_knapsack_value(costs, values, budget):
+    """
+    Straightforward 2-D unbounded knapsack (the original Tournament_optimised table) used as a reference.
+    """
+    n = len(costs)
+    dp = [[0] * (budget + 1) for _ in range(n + 1)]
+    for i in range(1, n + 1):
+        for b in range(budget + 1):
+            dp[i][b] = dp[i - 1][b]
+            if costs[i - 1] <= b:
+                dp[i][b] = max(dp[i][b], dp[i][b - costs[i - 1]] + values[i - 1])
+    return dp[n][budget]
+
+def test_solve_unbounded_knapsack():
+    """
+    Check the 1-D knapsack solver against the 2-D table on random instances, and that its chosen items add up.
+    """
+    print("Running unbounded knapsack solver tests...")
+
+    rng = random.Random(42)
+    for _ in range(200):
+        n = rng.randint(0, 6)
+        costs = [rng.randint(1, 30) for _ in range(n)]
+        values = [rng.randint(0, 50) for _ in range(n)]
+        budget = rng.randint(0, 120)
+
+        best, chosen = solve_unbounded_knapsack(costs, values, budget)
+        assert best == reference_knapsack_value(costs, values, budget), "Knapsack value is not optimal."
+        assert sum(values[i] for i in chosen) == best, "Chosen items do not add up to the best value."
+        assert sum(costs[i] for i in chosen) <= budget, "Chosen items exceed the budget."
+
+    #Costs sharing a granularity are solved on the reduced grid with the same result as on the full grid.
+    for _ in range(50):
+        n = rng.randint(1, 5)
+        costs = [7 * rng.randint(1, 10) for _ in range(n)]
+        values = [rng.randint(0, 50) for _ in range(n)]
+        budget = rng.randint(0, 400)
+        best, chosen = solve_unbounded_knapsack(costs, values, budget)
+        assert best == reference_knapsack_value(costs, values, budget), "Reduced-grid knapsack value is not optimal."
+        assert sum(costs[i] for i in chosen) <= budget, "Chosen items exceed the budget."
+
+    print("Unbounded knapsack solver tests passed.")
+
+def test_knapsack_cache():
+    """
+    Check that knapsack purchases are shared across Tournament_optimised instances, evicted LRU and persisted to disk.
+    """
+    print("Running knapsack cache tests...")
+
+    cache = KnapsackCache()
+    t1 = Tournament_optimised('./data/config.json')
+    t2 = Tournament_optimised('./data/config.json')
+    t1.knapsack_cache = t2.knapsack_cache = cache
+
+    team_a = t1.Team('Tesla', 50000)
+    team_b = t2.Team('Tesla', 50000)
+    t1._purchase_inventory(team_a)
+    t2._purchase_inventory(team_b)
+    assert (cache.hits, cache.misses) == (1, 1), "Second identical purchase should hit the cache."
+    assert team_a.inventory == team_b.inventory and team_a.budget == team_b.budget, "Cached purchase differs."
+
+    #Persist, reload into a fresh cache and hit again.
+    cache_path = './data/knapsack_cache_test.json'
+    cache.save(cache_path)
+    reloaded = KnapsackCache()
+    reloaded.load(cache_path)
+    os.remove(cache_path)
+    key = (t1.catalog.fingerprint, 'Tesla', 50000)
+    assert reloaded.get(key) == (team_a.inventory, 50000 - team_a.budget), "Reloaded entry incorrect."
+
+    #Least recently used entries are evicted first.
+    small = KnapsackCache(max_size=2)
+    small.put('a', [], 0)
+    small.put('b', [], 0)
+    small.get('a')
+    small.put('c', [], 0)
+    assert small.get('b') is None and small.get('a') is not None, "LRU eviction incorrect."
+
+    print("Knapsack cache tests passed.")
+
+def test_numpy_knapsack_matches_python():
+    """
+    Check the NumPy knapsack solver against the pure-Python solver on random instances (skipped without NumPy).
+    """
+    if np is None:
+        print("NumPy not installed, skipping NumPy knapsack tests.")
+        return
+    print("Running NumPy knapsack solver tests...")
+
+    rng = random.Random(7)
+    for _ in range(300):
+        n = rng.randint(0, 8)
+        costs = [rng.randint(1, 40) for _ in range(n)]
+        values = [rng.randint(0, 60) for _ in range(n)]
+        budget = rng.randint(0, 500)
+        expected = solve_unbounded_knapsack(costs, values, budget, use_numpy=False)
+        assert solve_unbounded_knapsack(costs, values, budget, use_numpy=True) == expected, \
+            "NumPy solver differs from the Python solver."
+
+    print("NumPy knapsack solver tests passed.")
+
 #Run the test.
 if __name__ == '__main__':
     test_optimised_vs_greedy()
+    test_solve_unbounded_knapsack()
+    test_knapsack_cache()
+    test_numpy_knapsack_matches_python()
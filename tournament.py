@@ -2,21 +2,380 @@
 #Author: Taylor King
 #Description This file contains the Tournament class for managing a bracketstyle car competition. It reads the configuration from a JSON file, loads any relevant attributes, and  manages sponsors, teams, car purchases, and the competition process.
 
+import hashlib
+import io
 import json
+import math
+import os
 import random
 import csv
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
+
+#NumPy is optional: it speeds up the knapsack solver when installed.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+#Car catalog class
+class CarCatalog:
+    """
+    Read-only, in-memory view of a car data csv, parsed once and indexed by Make.
+    Cost and MPG-H are stored as integers, each sponsor's cars are kept both in file order and
+    sorted by MPG-H per cost ratio, and a Model -> MPG-H map is precomputed for scoring.
+    """
+    #Shared catalogs keyed by absolute path, reused while the file is unchanged.
+    _cache = {}
+
+    def __init__(self, car_data_path):
+        """
+        Parses the csv at car_data_path.
+
+        :param car_data_path: Path to a csv with Make, Model, Cost and MPG-H columns.
+        :type car_data_path: str
+        """
+        self.car_data_path = car_data_path
+        self.by_make = {}
+        self.model_mpg = {}
+
+        #Read the file once: its content hash identifies this catalog in shared caches, and the same bytes are parsed.
+        with open(car_data_path, 'rb') as f:
+            data = f.read()
+        self.fingerprint = hashlib.sha256(data).hexdigest()
+        reader = csv.DictReader(io.StringIO(data.decode(), newline=''))
+        for row in reader:
+            car = {
+                'Model': row['Model'],
+                'Cost': int(row['Cost']),
+                'MPG-H': int(row['MPG-H']),
+                'Ratio': int(row['MPG-H']) / int(row['Cost']) #Efficiency clearly calculated.
+            }
+            self.by_make.setdefault(row['Make'], []).append(car)
+            self.model_mpg[row['Model']] = car['MPG-H']
+
+        #Sort each sponsor's cars once by MPG-H per cost ratio (descending), the greedy criterion.
+        self.by_make_ratio = {
+            make: sorted(cars, key=lambda x: x['Ratio'], reverse=True)
+            for make, cars in self.by_make.items()
+        }
+
+        #Compact view for large brackets: makes and cars numbered by id, with costs and scores in parallel arrays.
+        #Each make's cars get a contiguous range of ids in ratio order.
+        self.makes = sorted(self.by_make)
+        self.make_index = {make: i for i, make in enumerate(self.makes)}
+        self.car_models = []
+        self.car_costs = array('q')
+        self.car_mpg = array('q')
+        self.by_make_ratio_ids = []
+
+        #Negated running minimum cost along each make's ratio order. It is non-decreasing within a make, and the
+        #first position where it reaches -budget is the best ratio car affordable on budget, found by binary search.
+        self._neg_min_cost = array('q')
+        for make in self.makes:
+            start = len(self.car_models)
+            min_cost = math.inf
+            for car in self.by_make_ratio[make]:
+                self.car_models.append(car['Model'])
+                self.car_costs.append(car['Cost'])
+                self.car_mpg.append(self.model_mpg[car['Model']]) #Scored by Model, as Team does.
+                min_cost = min(min_cost, car['Cost'])
+                self._neg_min_cost.append(-min_cost)
+            self.by_make_ratio_ids.append(range(start, len(self.car_models)))
+
+    @classmethod
+    def load(cls, car_data_path):
+        """
+        Returns a shared catalog for car_data_path, re-reading the file only if it has changed since it was last parsed.
+        A change is detected from the file's (modification time, size), so a rewrite to the same size within the
+        filesystem's timestamp granularity is not noticed; clear CarCatalog._cache to force a re-read.
+
+        :param car_data_path: Path to the car data csv.
+        :return: CarCatalog instance.
+        """
+        key = os.path.abspath(car_data_path)
+        stat = os.stat(car_data_path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = cls._cache.get(key)
+        if cached is None or cached[0] != signature:
+            cached = (signature, cls(car_data_path))
+            cls._cache[key] = cached
+        return cached[1]
+
+    def cars(self, make):
+        """
+        Returns the cars made by make in file order (empty list if none).
+        """
+        return self.by_make.get(make, [])
+
+    def cars_by_ratio(self, make):
+        """
+        Returns the cars made by make sorted by MPG-H per cost ratio, best first (empty list if none).
+        """
+        return self.by_make_ratio.get(make, [])
+
+    def mpg(self, model):
+        """
+        Returns the MPG-H of model, or 0 if it is not in the catalog.
+        """
+        return self.model_mpg.get(model, 0)
+
+    def best_affordable_id(self, make_id, budget):
+        """
+        Returns the id of the car with the best MPG-H per cost ratio made by make_id that costs at most budget,
+        or None. O(log n) in the make's number of cars.
+        """
+        ids = self.by_make_ratio_ids[make_id]
+        i = bisect_left(self._neg_min_cost, -budget, ids.start, ids.stop)
+        return i if i < ids.stop else None
+
+    def best_affordable(self, make, budget):
+        """
+        Returns the car made by make with the best MPG-H per cost ratio that costs at most budget, or None.
+        """
+        make_id = self.make_index.get(make)
+        if make_id is None:
+            return None
+        car_id = self.best_affordable_id(make_id, budget)
+        return None if car_id is None else self.by_make_ratio[make][car_id - self.by_make_ratio_ids[make_id].start]
+
+#Prize money awarded to the winner of every match.
+PRIZE_MONEY = 50000
+
+#Per-worker copy of the Tournament (with its catalog), set once by the pool initializer rather than pickled per purchase.
+_worker_tournament = None
+
+def _init_match_worker(tournament):
+    global _worker_tournament
+    _worker_tournament = tournament
+
+def _choose_car_in_worker(team_state):
+    """
+    Chooses a winner's car in a process pool worker, from a (sponsor, budget, inventory) copy of the team.
+    """
+    sponsor, budget, inventory = team_state
+    team = _worker_tournament.Team(sponsor, budget, _worker_tournament._model_mpg)
+    team.inventory = inventory
+    return _worker_tournament._choose_single_car(team)
+
+#Unbounded knapsack solver
+def _knapsack_table_python(costs, values, budget):
+    """
+    Fills best[b] (best value with budget b) and last[b] (item last taken to reach it) one budget at a time.
+    """
+    best = [0] * (budget + 1)
+    last = array('i', [-1]) * (budget + 1)
+
+    for i, (cost, value) in enumerate(zip(costs, values)):
+        if cost <= 0:
+            continue
+        #Ascending b lets best[b - cost] already include copies of item i (unbounded).
+        for b in range(cost, budget + 1):
+            take = best[b - cost] + value
+            if take > best[b]:
+                best[b] = take
+                last[b] = i
+    return best, last
+
+def _knapsack_table_numpy(costs, values, budget):
+    """
+    Same table as _knapsack_table_python, with each item processed by whole-array NumPy operations.
+    Taking item i (cost c, value v) any number of times gives, for every budget b,
+        best'[b] = max over j >= 0 of best[b - j*c] + j*v.
+    Laying the budgets out as rows of length c puts b, b - c, b - 2c, ... in one column, so after
+    subtracting k*v from row k this is a running maximum down each column, then k*v is added back.
+    """
+    dtype = np.int64 if all(isinstance(v, int) for v in values) else np.float64
+    length = budget + 1
+    best = np.zeros(length, dtype=dtype)
+    last = np.full(length, -1, dtype=np.int64)
+    floor = np.iinfo(dtype).min // 2 if dtype == np.int64 else -np.inf
+
+    for i, (cost, value) in enumerate(zip(costs, values)):
+        if cost <= 0 or cost > budget:
+            continue
+        rows = -(-length // cost)
+        padded = np.full(rows * cost, floor, dtype=dtype)
+        padded[:length] = best
+        grid = padded.reshape(rows, cost)
+        steps = (np.arange(rows, dtype=dtype) * value)[:, None]
+        updated = (np.maximum.accumulate(grid - steps, axis=0) + steps).ravel()[:length]
+
+        improved = updated > best
+        best = np.where(improved, updated, best)
+        last[improved] = i
+    return best.tolist(), last.tolist()
+
+def solve_unbounded_knapsack(costs, values, budget, use_numpy=None):
+    """
+    Solves the unbounded knapsack problem: choose items (each any number of times) with total cost
+    at most budget, maximising total value.
+    Uses a single 1-D array best[b] (best value with budget b) and a parallel array last[b] holding
+    the index of the item last taken to reach best[b]. Memory is O(budget) rather than O(n * budget).
+    Items with non-positive cost are ignored.
+
+    Costs usually share a coarse granularity (e.g. round thousands), so the problem is first solved
+    on the reduced grid: every cost is divided by their greatest common divisor g and the budget by
+    g (rounded down, since no combination of costs can use the remainder). The result is identical
+    and the arrays are g times smaller.
+
+    When NumPy is installed the table is filled with vectorised array operations per item; the
+    result is the same as the pure-Python loop.
+
+    :param costs: Integer cost of each item.
+    :param values: Value of each item.
+    :param budget: Non-negative integer budget.
+    :param use_numpy: Force (True) or disable (False) the NumPy solver; by default it is used if available.
+    :return: (best value, list of chosen item indices in ascending order, with repeats).
+    """
+    granularity = reduce(math.gcd, (cost for cost in costs if cost > 0), 0) or 1
+    grid_costs = [cost // granularity for cost in costs]
+    grid_budget = budget // granularity
+
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        best, last = _knapsack_table_numpy(grid_costs, values, grid_budget)
+    else:
+        best, last = _knapsack_table_python(grid_costs, values, grid_budget)
+
+    #Follow the back-pointers from the full budget.
+    chosen = []
+    b = grid_budget
+    while last[b] != -1:
+        i = last[b]
+        chosen.append(i)
+        b -= grid_costs[i]
+    chosen.sort()
+    return best[grid_budget], chosen
+
+#Knapsack cache class
+class KnapsackCache:
+    """
+    LRU cache of optimal knapsack purchases keyed by (catalog fingerprint, sponsor, budget).
+    One instance can be shared by any number of Tournament_optimised objects, and saved to or loaded
+    from a json file so that results carry over between runs.
+    """
+    def __init__(self, max_size=10000):
+        """
+        :param max_size: Maximum number of cached purchases before the least recently used is evicted.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns the cached (models, total_cost) for key, or None, counting a hit or miss.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, models, total_cost):
+        """
+        Stores the optimal purchase for key, evicting the least recently used entry if full.
+        """
+        self.entries[key] = (list(models), total_cost)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def save(self, path):
+        """
+        Writes the cached purchases to a json file, least recently used first.
+        """
+        with open(path, 'w') as f:
+            json.dump([[*key, models, cost] for key, (models, cost) in self.entries.items()], f)
+
+    def load(self, path):
+        """
+        Adds the purchases saved in a json file to the cache.
+        """
+        with open(path, 'r') as f:
+            for fingerprint, sponsor, budget, models, cost in json.load(f):
+                self.put((fingerprint, sponsor, budget), models, cost)
+
+    def __len__(self):
+        return len(self.entries)
+
+#Inventory class
+class Inventory(list):
+    """
+    A team's list of car Models that keeps the owning team's total_mpg in step.
+    append and extend add to the total; any other change recomputes it from scratch.
+    """
+    def __init__(self, team, models=()):
+        super().__init__(models)
+        self._team = team
+
+    def append(self, model):
+        super().append(model)
+        self._team.total_mpg += self._team._model_mpg(model)
+
+    def extend(self, models):
+        models = list(models)
+        super().extend(models)
+        self._team.total_mpg += sum(self._team._model_mpg(model) for model in models)
+
+    def __iadd__(self, models):
+        self.extend(models)
+        return self
+
+    def _changed(self):
+        self._team._recompute_total_mpg()
+
+    def insert(self, i, model):
+        super().insert(i, model)
+        self._changed()
+
+    def remove(self, model):
+        super().remove(model)
+        self._changed()
+
+    def pop(self, i=-1):
+        model = super().pop(i)
+        self._changed()
+        return model
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._changed()
+        return result
 
 #Tournament class
 class Tournament:
     """
     Represents a bracket-style competition focused on fuel-efficient cars and teams sponsored by car makers.
     """
-    def __init__(self, config_path='./data/config.json'):
+    def __init__(self, config_path='./data/config.json', seed=None):
         """
         Initialises the Tournament by reading a json config file.
 
         :param config_path: Path to the config file.
         :type config_path: str
+        :param seed: Optional seed for a private random number generator; if None the global random module is used.
         :raises TypeError: If 'nteams' is not an integer.
         :raises AssertionError: If 'nteams' is not positive and non-zero.
         :raises AssertionError: If 'nteams' is not a power of two.
@@ -27,17 +386,7 @@ class Tournament:
         #Required attributes from config.json as follows:
         self.name = config['tournament_name']
         self.car_data_path = config['car_data_path']
-        self.nteams = config.get('nteams', 16)
-
-        #Validate that nteams is an integer.
-        if not isinstance(self.nteams, int):
-            raise TypeError("The number of teams must be an integer.")
-
-        #Validate that nteams is positive and non-zero integer.
-        assert self.nteams > 0, "Number of teams must be positive and non-zero."
-
-        #Validate that nteams is a power of two.
-        assert (self.nteams & (self.nteams - 1) == 0), "Number of teams must be a power of two."
+        self.nteams = self._validate_nteams(config.get('nteams', 16))
 
         self.default_low = config['default_low']
         self.default_high = config['default_high']
@@ -47,6 +396,62 @@ class Tournament:
         self.budgets = []
         self.teams = []
 
+        #Car catalog, loaded on first use.
+        self._catalog = None
+
+        #Random number generator for sponsors and budgets, private when seeded so runs are reproducible.
+        self.rng = random if seed is None else random.Random(seed)
+
+        #Cars chosen concurrently by hold_event, keyed by id(team), waiting to be bought.
+        self._chosen_cars = {}
+
+    def __getstate__(self):
+        """
+        Pickled state, as sent to process pool workers by hold_event. The catalog is loaded first so workers
+        receive it, teams are left out, and an unseeded Tournament gets the worker's global random module back.
+        """
+        self.catalog
+        state = self.__dict__.copy()
+        state['teams'] = []
+        state.pop('champion', None)
+        if state['rng'] is random:
+            state['rng'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.rng is None:
+            self.rng = random
+
+    @staticmethod
+    def _validate_nteams(nteams):
+        """
+        Returns nteams if it is a valid number of teams.
+
+        :raises TypeError: If nteams is not an integer.
+        :raises AssertionError: If nteams is not positive and non-zero, or not a power of two.
+        """
+        #Validate that nteams is an integer.
+        if not isinstance(nteams, int):
+            raise TypeError("The number of teams must be an integer.")
+
+        #Validate that nteams is positive and non-zero integer.
+        assert nteams > 0, "Number of teams must be positive and non-zero."
+
+        #Validate that nteams is a power of two.
+        assert (nteams & (nteams - 1) == 0), "Number of teams must be a power of two."
+        return nteams
+
+    @property
+    def catalog(self):
+        """
+        The CarCatalog for car_data_path, loaded once per Tournament and shared with other Tournaments using the same file.
+        Loaded again if car_data_path has been changed since.
+        """
+        if self._catalog is None or self._catalog.car_data_path != self.car_data_path:
+            self._catalog = CarCatalog.load(self.car_data_path)
+        return self._catalog
+
     def __ge__(self, other):
         """
         Compare two Tournament instances based on their champion's performance.
@@ -113,9 +518,9 @@ class Tournament:
             assert len(sponsor_list) <= self.nteams, "Sponsor list longer than number of teams."
             self.sponsors.extend(sponsor_list)
     
-        #Select remaining sponsors randomly with no duplicates.
-        remaining_makers = list(set(available_makers) - set(self.sponsors))
-        random.shuffle(remaining_makers)
+        #Select remaining sponsors randomly with no duplicates (sorted first so a seed fully determines the draw).
+        remaining_makers = sorted(set(available_makers) - set(self.sponsors))
+        self.rng.shuffle(remaining_makers)
         while len(self.sponsors) < self.nteams:
             self.sponsors.append(remaining_makers.pop())
     
@@ -124,7 +529,7 @@ class Tournament:
             if fixed_budget is not None:
                 budget = fixed_budget
             else:
-                budget = random.randrange(low, high + incr, incr)
+                budget = self.rng.randrange(low, high + incr, incr)
             self.budgets.append(budget)
 
     def generate_teams(self):
@@ -133,7 +538,7 @@ class Tournament:
         """
         self.teams = []
         for sponsor, budget in zip(self.sponsors, self.budgets):
-            team = self.Team(sponsor, budget)
+            team = self.Team(sponsor, budget, self._model_mpg)
             self.teams.append(team)
 
     def buy_cars(self):
@@ -152,21 +557,8 @@ class Tournament:
     
         :param team: The Team object for which inventory is purchased.
         """
-        #Load car data clearly from csv file.
-        available_cars = []
-        with open(self.car_data_path, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['Make'] == team.sponsor:
-                    available_cars.append({
-                        'Model': row['Model'],
-                        'Cost': int(row['Cost']),
-                        'MPG-H': int(row['MPG-H']),
-                        'Ratio': int(row['MPG-H']) / int(row['Cost']) #Efficiency clearly calculated.
-                    })
-    
-        #Sort cars clearly by MPG-H per cost ratio (descending) greedy criterion.
-        available_cars.sort(key=lambda x: x['Ratio'], reverse=True)
+        #Cars of the sponsor, already sorted by MPG-H per cost ratio (descending) greedy criterion.
+        available_cars = self.catalog.cars_by_ratio(team.sponsor)
     
         #Clear loop to buy cars greedily.
         for car in available_cars:
@@ -174,93 +566,128 @@ class Tournament:
                 team.inventory.append(car['Model'])
                 team.budget -= car['Cost'] #Clearly update budget.
 
-    def hold_event(self):
+    def hold_event(self, executor=None, workers=None, chunksize=1):
         """
         Runs the tournament event through pairwise matches until one champion remains.
         Each winner receives a £50,000 prize after match victory and immediately buys one additional car.
+        Purchases within a round only touch their own winner, so with an executor every winner's car is chosen
+        concurrently by _choose_single_car, then bought through _purchase_single_car in bracket order;
+        the outcome does not depend on the executor.
+
+        :param executor: Optional executor class (or factory taking max_workers, initializer and initargs), e.g.
+            ThreadPoolExecutor or ProcessPoolExecutor, used to choose each round's purchases. A ThreadPoolExecutor
+            calls _choose_single_car on the teams directly. Any other executor is treated as process based: its
+            workers receive a copy of the Tournament once, through the pool initializer, and each task carries only
+            the winner's (sponsor, budget, inventory).
+        :param workers: Maximum number of workers in the pool (default chosen by the executor).
+        :param chunksize: Purchases sent to a process pool worker at a time.
         """
+        pool = None
+        if executor is not None:
+            pool = executor(max_workers=workers, initializer=_init_match_worker, initargs=(self,))
+
         active_teams = self.teams.copy()
-    
-        #Loop until one champion remains.
-        while len(active_teams) > 1:
-            next_round_teams = []
-    
-            #Pairwise matchups.
-            for i in range(0, len(active_teams), 2):
-                team_a = active_teams[i]
-                team_b = active_teams[i+1]
-    
-                #Calculate total MPG-H clearly.
-                mpg_a = self._team_total_mpg(team_a)
-                mpg_b = self._team_total_mpg(team_b)
-    
-                #Decide match winner clearly.
-                winner, loser = (team_a, team_b) if mpg_a >= mpg_b else (team_b, team_a)
-    
-                #Update performance clearly.
-                winner.performance['wins'] += 1
-                loser.performance['losses'] += 1
-                winner.performance['scores'].append(max(mpg_a, mpg_b))
-                loser.active = False #Eliminated clearly.
-    
-                #Award prize money clearly.
-                winner.budget += 50000
-    
-                #Winner buys exactly one additional car (clearly enforced).
-                self._purchase_single_car(winner)
-    
-                #Advance winner clearly.
-                next_round_teams.append(winner)
-    
-            active_teams = next_round_teams
+        try:
+            #Loop until one champion remains.
+            while len(active_teams) > 1:
+                next_round_teams = []
+
+                #Pairwise matchups.
+                for i in range(0, len(active_teams), 2):
+                    team_a = active_teams[i]
+                    team_b = active_teams[i+1]
+
+                    #Calculate total MPG-H clearly.
+                    mpg_a = self._team_total_mpg(team_a)
+                    mpg_b = self._team_total_mpg(team_b)
+
+                    #Decide match winner clearly.
+                    winner, loser = (team_a, team_b) if mpg_a >= mpg_b else (team_b, team_a)
+
+                    #Update performance clearly.
+                    winner.performance['wins'] += 1
+                    loser.performance['losses'] += 1
+                    winner.performance['scores'].append(max(mpg_a, mpg_b))
+                    loser.active = False #Eliminated clearly.
+
+                    #Award prize money clearly.
+                    winner.budget += PRIZE_MONEY
+
+                    #Advance winner clearly.
+                    next_round_teams.append(winner)
+
+                #Each winner buys exactly one additional car (clearly enforced).
+                self._purchase_round(next_round_teams, pool, chunksize)
+
+                active_teams = next_round_teams
+        finally:
+            if pool is not None:
+                pool.shutdown()
     
         #Clearly record the final champion.
         self.champion = active_teams[0]
+
+    def _purchase_round(self, winners, pool=None, chunksize=1):
+        """
+        Buys one car for each winner of a round, in bracket order. With a pool, the cars are chosen
+        concurrently first and _purchase_single_car buys the chosen car.
+        """
+        if pool is not None:
+            if isinstance(pool, ThreadPoolExecutor):
+                cars = pool.map(self._choose_single_car, winners)
+            else:
+                states = [(team.sponsor, team.budget, list(team.inventory)) for team in winners]
+                cars = pool.map(_choose_car_in_worker, states, chunksize=chunksize)
+            self._chosen_cars = {id(team): car for team, car in zip(winners, cars)}
+
+        try:
+            for team in winners:
+                self._purchase_single_car(team)
+        finally:
+            self._chosen_cars = {}
     
+    def _model_mpg(self, model):
+        """
+        Returns the MPG-H of a model from the catalog (0 if unknown).
+        """
+        return self.catalog.mpg(model)
+
     def _team_total_mpg(self, team):
         """
-        Calculates total MPG-H for all cars in team's inventory.
+        Returns the total MPG-H for all cars in team's inventory, read from the team's running total.
         """
         if team is None or not team.inventory:
             return 0  #Avoids errors when champion has no cars.
 
-        
-        total_mpg = 0
-        with open(self.car_data_path, 'r') as f:
-            reader = csv.DictReader(f)
-            car_mpg = {row['Model']: int(row['MPG-H']) for row in reader}
-    
-        for car in team.inventory:
-            total_mpg += car_mpg.get(car, 0)
-    
-        return total_mpg
+        #Teams created outside generate_teams start scoring against this Tournament's catalog.
+        if team.mpg_lookup is None:
+            team.set_mpg_lookup(self._model_mpg)
+
+        return team.total_mpg
     
     def _purchase_single_car(self, team):
         """
         Purchases exactly one car after winning, clearly following the greedy method.
         """
-        available_cars = []
-        with open(self.car_data_path, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['Make'] == team.sponsor:
-                    available_cars.append({
-                        'Model': row['Model'],
-                        'Cost': int(row['Cost']),
-                        'MPG-H': int(row['MPG-H']),
-                        'Ratio': int(row['MPG-H']) / int(row['Cost'])
-                    })
-    
-        #Sort clearly by best efficiency.
-        available_cars.sort(key=lambda x: x['Ratio'], reverse=True)
-    
-        #Attempt to buy exactly one car (clearly enforced).
-        for car in available_cars:
-            if car['Cost'] <= team.budget:
-                print(f"Champion {team.sponsor} is buying {car['Model']} for {car['Cost']} (Remaining budget: {team.budget})")
-                team.inventory.append(car['Model'])
-                team.budget -= car['Cost']
-                return  #**Fix: Ensure only ONE purchase is made.**
+        #Use the car already chosen concurrently by hold_event, if any, else choose now.
+        if id(team) in self._chosen_cars:
+            car = self._chosen_cars.pop(id(team))
+        else:
+            car = self._choose_single_car(team)
+
+        #Buy exactly one car (clearly enforced).
+        if car is not None:
+            print(f"Champion {team.sponsor} is buying {car['Model']} for {car['Cost']} (Remaining budget: {team.budget})")
+            team.inventory.append(car['Model'])
+            team.budget -= car['Cost']
+
+    def _choose_single_car(self, team):
+        """
+        Purchase strategy after a win: returns the car team buys, or None, without changing team.
+        Greedy by default, the sponsor's best efficiency car within budget. Override for other strategies;
+        hold_event may call this concurrently for the winners of a round, including in other processes.
+        """
+        return self.catalog.best_affordable(team.sponsor, team.budget)
 
     def show_win_record(self):
         """
@@ -287,16 +714,20 @@ class Tournament:
     class Team:
         """
         Represents a single competing team with sponsor, budget, inventory, active status, and performance record.
+        The team's total MPG-H is kept up to date as cars are added, so scoring a team is O(1).
         """
-        def __init__(self, sponsor, budget):
+        def __init__(self, sponsor, budget, mpg_lookup=None):
             """
             Initialises a Team object.
     
             :param sponsor: The car maker sponsoring this team.
             :param budget: Initial budget allocated to the team.
+            :param mpg_lookup: Optional function mapping a Model to its MPG-H, used for the running total.
             """
             self.sponsor = sponsor            #Immutable
             self.budget = budget              #Mutable (budget changes after car purchases)
+            self.mpg_lookup = mpg_lookup
+            self.total_mpg = 0                #Running MPG-H total of the inventory
             self.inventory = []               #Mutable (cars are added throughout tournament)
             self.active = True                #Mutable (changes if eliminated)
             self.performance = {              #Mutable (updated after matches)
@@ -306,6 +737,31 @@ class Tournament:
                 'cars_used': 0
             }
     
+        @property
+        def inventory(self):
+            """
+            The team's cars (Model names). Appending updates total_mpg incrementally; other changes recompute it.
+            """
+            return self._inventory
+
+        @inventory.setter
+        def inventory(self, models):
+            self._inventory = Inventory(self, models)
+            self._recompute_total_mpg()
+
+        def set_mpg_lookup(self, mpg_lookup):
+            """
+            Sets the Model -> MPG-H function and recomputes total_mpg with it.
+            """
+            self.mpg_lookup = mpg_lookup
+            self._recompute_total_mpg()
+
+        def _model_mpg(self, model):
+            return self.mpg_lookup(model) if self.mpg_lookup is not None else 0
+
+        def _recompute_total_mpg(self):
+            self.total_mpg = sum(self._model_mpg(model) for model in self._inventory)
+
         def __str__(self):
             """
             Returns a clear, readable representation of the team.
@@ -316,7 +772,9 @@ class Tournament_optimised(Tournament):
     """
     A subclass of Tournament that implements a dynamic programming (unbounded knapsack)
     approach to select the best combination of cars for a given budget.
+    Solutions are memoised in knapsack_cache, which by default is shared by every instance.
     """
+    knapsack_cache = KnapsackCache()
 
     def _purchase_inventory(self, team):
         """
@@ -325,56 +783,337 @@ class Tournament_optimised(Tournament):
 
         :param team: The Team object for which inventory is purchased.
         """
-        available_cars = []
-        with open(self.car_data_path, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['Make'] == team.sponsor:
-                    available_cars.append({
-                        'Model': row['Model'],
-                        'Cost': int(row['Cost']),
-                        'MPG-H': int(row['MPG-H'])
-                    })
-
-        n = len(available_cars)
         budget = team.budget
+        key = (self.catalog.fingerprint, team.sponsor, budget)
+
+        cached = self.knapsack_cache.get(key)
+        if cached is None:
+            available_cars = self.catalog.cars(team.sponsor)
+
+            # Solve on a 1-D value array with back-pointers, then map indices back to cars.
+            _, chosen = solve_unbounded_knapsack([c['Cost'] for c in available_cars],
+                                                 [c['MPG-H'] for c in available_cars], budget)
+            best_inventory = [available_cars[i] for i in chosen]
+            cached = ([c['Model'] for c in best_inventory], sum(c['Cost'] for c in best_inventory))
+            self.knapsack_cache.put(key, *cached)
 
-        # dp[i][b] = maximum MPG-H using the first i cars with budget b
-        dp = [[0]*(budget+1) for _ in range(n+1)]
-        # car_selection[i][b] = the actual list of cars that produce dp[i][b]
-        car_selection = [[[] for _ in range(budget+1)] for _ in range(n+1)]
-
-        for i in range(1, n+1):
-            car = available_cars[i-1]
-            cost = car['Cost']
-            mpg = car['MPG-H']
-
-            for b in range(budget+1):
-                # 1) Skip this car
-                skip_val = dp[i-1][b]
-                skip_sel = car_selection[i-1][b]
-
-                # 2) Use this car if cost <= b (unbounded => dp[i][b-cost], not dp[i-1][b-cost])
-                if cost <= b:
-                    take_val = dp[i][b-cost] + mpg
-                    take_sel = car_selection[i][b-cost] + [car]
-                else:
-                    take_val = -1  # invalid
-
-                # Compare skip vs take
-                if skip_val >= take_val:
-                    dp[i][b] = skip_val
-                    car_selection[i][b] = skip_sel
-                else:
-                    dp[i][b] = take_val
-                    car_selection[i][b] = take_sel
-
-        # Reconstruct best selection from dp[n][budget]
-        best_inventory = car_selection[n][budget]
-        team.inventory = [c['Model'] for c in best_inventory]
+        models, total_cost = cached
+        team.inventory = models
 
         # Deduct total cost of all chosen cars
-        total_cost = sum(c['Cost'] for c in best_inventory)
         team.budget = budget - total_cost
 
         print(f"DP selected: {team.inventory}, Remaining budget: {team.budget}")
+
+#Team table class
+class TeamTable:
+    """
+    Struct-of-arrays storage for the teams of a large bracket. Team i is described by the i-th entry
+    of each array, sponsors are catalog make ids and inventories are catalog car ids, so a team costs
+    a few dozen bytes instead of a Team object with its own dict, lists and strings.
+    Purchases and matches are kept in append-only logs; each team's purchases and match wins form
+    linked lists through the logs, so one team's inventory or scores are read without a scan.
+    """
+    def __init__(self, catalog, sponsor_ids, budgets):
+        """
+        :param catalog: CarCatalog the make and car ids refer to.
+        :param sponsor_ids: Catalog make id of each team's sponsor.
+        :param budgets: Initial budget of each team.
+        """
+        assert len(sponsor_ids) == len(budgets), "One budget per sponsor is required."
+        n = len(budgets)
+        self.catalog = catalog
+        self.sponsor_ids = array('H', sponsor_ids)
+        self.budgets = array('q', budgets)
+        self.wins = array('B', bytes(n))
+        self.losses = array('B', bytes(n))
+        self.total_mpg = array('q', bytes(8 * n))
+        self.active = bytearray(b'\x01') * n
+        self.last_purchase = array('i', [-1]) * n
+        self.last_win = array('i', [-1]) * n
+
+        #Purchase log: car id bought, and the index of the same team's previous purchase (-1 for none).
+        self.purchase_cars = array('I')
+        self.purchase_prev = array('i')
+
+        #Match log in the order played: winning team, its score, and the same team's previous win (-1 for none).
+        self.match_winners = array('I')
+        self.match_scores = array('q')
+        self.match_prev = array('i')
+
+    def __len__(self):
+        return len(self.budgets)
+
+    def __getitem__(self, i):
+        """
+        Returns a TeamView of team i.
+        """
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Team index out of range.")
+        return TeamView(self, i)
+
+    def __iter__(self):
+        return (TeamView(self, i) for i in range(len(self)))
+
+    def buy(self, team, car_id):
+        """
+        Adds car_id to team's inventory, paying for it from the team's budget.
+        """
+        self.purchase_cars.append(car_id)
+        self.purchase_prev.append(self.last_purchase[team])
+        self.last_purchase[team] = len(self.purchase_cars) - 1
+        self.budgets[team] -= self.catalog.car_costs[car_id]
+        self.total_mpg[team] += self.catalog.car_mpg[car_id]
+
+    def record_match(self, winner, loser, score):
+        """
+        Records the result of a match between teams winner and loser.
+        """
+        self.wins[winner] += 1
+        self.losses[loser] += 1
+        self.active[loser] = 0
+        self.match_winners.append(winner)
+        self.match_scores.append(score)
+        self.match_prev.append(self.last_win[winner])
+        self.last_win[winner] = len(self.match_scores) - 1
+
+    def inventory_ids(self, team):
+        """
+        Returns the car ids of team's inventory in purchase order.
+        """
+        ids = []
+        purchase = self.last_purchase[team]
+        while purchase != -1:
+            ids.append(self.purchase_cars[purchase])
+            purchase = self.purchase_prev[purchase]
+        ids.reverse()
+        return ids
+
+    def inventory(self, team):
+        """
+        Returns the Models in team's inventory in purchase order.
+        """
+        return [self.catalog.car_models[car_id] for car_id in self.inventory_ids(team)]
+
+    def scores(self, team):
+        """
+        Returns team's score in each match it won, in the order played.
+        """
+        scores = []
+        match = self.last_win[team]
+        while match != -1:
+            scores.append(self.match_scores[match])
+            match = self.match_prev[match]
+        scores.reverse()
+        return scores
+
+#Team view class
+class TeamView:
+    """
+    A lightweight, Team-like view of one row of a TeamTable, created on demand.
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def sponsor(self):
+        return self.table.catalog.makes[self.table.sponsor_ids[self.index]]
+
+    @property
+    def budget(self):
+        return self.table.budgets[self.index]
+
+    @property
+    def inventory(self):
+        return self.table.inventory(self.index)
+
+    @property
+    def total_mpg(self):
+        return self.table.total_mpg[self.index]
+
+    @property
+    def active(self):
+        return bool(self.table.active[self.index])
+
+    @property
+    def mpg_lookup(self):
+        return self.table.catalog.mpg
+
+    @property
+    def performance(self):
+        """
+        A snapshot of the team's performance record, in the same form as Team.performance.
+        """
+        return {
+            'wins': self.table.wins[self.index],
+            'losses': self.table.losses[self.index],
+            'scores': self.table.scores(self.index),
+            'cars_used': 0
+        }
+
+    def __eq__(self, other):
+        return isinstance(other, TeamView) and self.table is other.table and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.table), self.index))
+
+    def __str__(self):
+        return f"Team {self.sponsor} | Budget: ${self.budget} | Active: {self.active} | Inventory: {self.inventory}"
+
+class Tournament_large(Tournament):
+    """
+    A subclass of Tournament for very large brackets (e.g. 2^20 teams). Sponsors are drawn with
+    replacement from the makes in the car catalog, so nteams is not limited by the number of makers,
+    and teams are stored in a TeamTable rather than as Team objects. Purchases follow the same greedy
+    rules as Tournament, and matches are played silently.
+    """
+    def __init__(self, config_path='./data/config.json', seed=None, nteams=None):
+        """
+        :param config_path: Path to the config file.
+        :param seed: Optional seed for a private random number generator.
+        :param nteams: Optional number of teams, overriding the config file.
+        """
+        super().__init__(config_path, seed)
+        if nteams is not None:
+            self.nteams = self._validate_nteams(nteams)
+
+    @property
+    def sponsors(self):
+        """
+        Sponsor names of every team. Stored as catalog make ids in sponsor_ids.
+        """
+        return [self.catalog.makes[i] for i in self.sponsor_ids]
+
+    @sponsors.setter
+    def sponsors(self, names):
+        self.sponsor_ids = array('H', (self.catalog.make_index[name] for name in names))
+
+    def generate_sponsors(self, sponsor_list=None, low=None, high=None, incr=None, fixed_budget=None):
+        """
+        Draws a sponsor and budget for each team. Sponsors are drawn with replacement from the catalog's makes.
+
+        :param sponsor_list: Optional list of sponsors to explicitly include (each must be in the catalog).
+        :param low: Lower bound for random budgets (default from config).
+        :param high: Upper bound for random budgets (default from config).
+        :param incr: Increment for budgets (default from config).
+        :param fixed_budget: Optional fixed budget for all teams.
+        :raises AssertionError: If fixed_budget is provided but outside allowed range.
+        :raises KeyError: If a sponsor in sponsor_list has no cars in the catalog.
+        """
+        low = low if low is not None else self.default_low
+        high = high if high is not None else self.default_high
+        incr = incr if incr is not None else self.default_incr
+
+        if fixed_budget is not None:
+            assert low <= fixed_budget <= high, "fixed_budget must be within low and high bounds."
+
+        sponsor_list = sponsor_list or []
+        assert len(sponsor_list) <= self.nteams, "Sponsor list longer than number of teams."
+        assert self.catalog.makes, "The car catalog has no makes to draw sponsors from."
+
+        remaining = self.nteams - len(sponsor_list)
+        self.sponsors = sponsor_list
+        self.sponsor_ids.extend(self.rng.choices(range(len(self.catalog.makes)), k=remaining))
+
+        if fixed_budget is not None:
+            self.budgets = array('q', [fixed_budget]) * self.nteams
+        else:
+            self.budgets = array('q', self.rng.choices(range(low, high + incr, incr), k=self.nteams))
+
+    def generate_teams(self):
+        """
+        Stores every sponsor and budget pair as a row of a TeamTable.
+        """
+        self.teams = TeamTable(self.catalog, self.sponsor_ids, self.budgets)
+
+    def buy_cars(self):
+        """
+        Buys each team's initial inventory greedily, as Tournament does. Purchases depend only on
+        sponsor and budget, so each distinct pair is solved once.
+        """
+        plans = {}
+        table = self.teams
+        for team in range(len(table)):
+            key = (table.sponsor_ids[team], table.budgets[team])
+            plan = plans.get(key)
+            if plan is None:
+                plan = plans[key] = self._greedy_plan(*key)
+            for car_id in plan:
+                table.buy(team, car_id)
+
+    def _greedy_plan(self, make_id, budget):
+        """
+        Returns the car ids bought greedily, best MPG-H per cost first, by make_id with budget.
+        """
+        plan = []
+        for car_id in self.catalog.by_make_ratio_ids[make_id]:
+            cost = self.catalog.car_costs[car_id]
+            if cost <= budget:
+                plan.append(car_id)
+                budget -= cost
+        return plan
+
+    def hold_event(self, executor=None, workers=None, chunksize=1):
+        """
+        Runs the bracket as Tournament.hold_event does, on team indices. Memory is O(nteams) and
+        time is O(nteams) matches. Matches are always played sequentially: each is a few array
+        operations, cheaper than dispatching it, so executor, workers and chunksize are accepted
+        for compatibility with Tournament.hold_event and ignored.
+        """
+        table = self.teams
+        total_mpg = table.total_mpg
+        active_teams = array('I', range(len(table)))
+
+        while len(active_teams) > 1:
+            next_round_teams = array('I')
+            for i in range(0, len(active_teams), 2):
+                team_a, team_b = active_teams[i], active_teams[i + 1]
+                mpg_a, mpg_b = total_mpg[team_a], total_mpg[team_b]
+                winner, loser = (team_a, team_b) if mpg_a >= mpg_b else (team_b, team_a)
+                table.record_match(winner, loser, max(mpg_a, mpg_b))
+                table.budgets[winner] += PRIZE_MONEY
+                self._buy_best_car(winner)
+                next_round_teams.append(winner)
+            active_teams = next_round_teams
+
+        self.champion = table[active_teams[0]]
+
+    def _buy_best_car(self, team):
+        """
+        Buys the single highest MPG-H per cost car team's sponsor makes that team can afford, if any.
+        """
+        table = self.teams
+        car_id = self.catalog.best_affordable_id(table.sponsor_ids[team], table.budgets[team])
+        if car_id is not None:
+            table.buy(team, car_id)
+
+    def _purchase_single_car(self, team):
+        """
+        Purchases exactly one car for a TeamView of this tournament, as Tournament does.
+        """
+        self._buy_best_car(team.index)
+
+    def _team_total_mpg(self, team):
+        """
+        Returns the total MPG-H of a TeamView's inventory.
+        """
+        return 0 if team is None else team.total_mpg
+
+    def show_win_record(self):
+        """
+        Prints the win-loss record for each team, one row per team index since sponsors can repeat.
+        """
+        print("\nTournament Win-Loss Record:\n")
+
+        table = self.teams
+        labels = [f"{table.catalog.makes[make_id]} #{i}" for i, make_id in enumerate(table.sponsor_ids)]
+        max_len = max(len(label) for label in labels)
+        for i, label in enumerate(labels):
+            #A team wins every match until its only loss.
+            results = ['W     '] * table.wins[i] + ['L     '] * table.losses[i]
+            print(f"{label.rjust(max_len)}: {results}")